@@ -1,85 +1,126 @@
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-import time
-import json
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from radar.config import BATCH_SIZE, OLLAMA_HOSTS
+from radar.export import lazy_export
+from radar.ollama import SummaryEngine, cached_summary, warm_up
+from radar.scraping import compile_sites, fetch_section, get_fetcher
 
-OLLAMA = "http://localhost:11434"
+OLLAMA = OLLAMA_HOSTS  # RADAR_OLLAMA, uno o varios servidores separados por coma
 MODEL = "gemma3:1b"
+PROMPT = "Give a one sentence summary of the following news content, and only print that one sentence:\n{text}"
+MAX_IN_FLIGHT = 4
 
-# URLs de las páginas de economía
+# Páginas de economía: portada, selector de los enlaces a las notas y
+# (opcional) de los párrafos de cada nota. Selectores CSS o XPath (con "/").
+# Para sumar un sitio alcanza con agregarlo acá.
 URLS = {
-    "Infobae": "https://www.infobae.com/economia/",
-    "Ambito": "https://www.ambito.com/economia",
-    "Cronista": "https://www.cronista.com/ultimas-noticias/"
+    "Infobae": {"url": "https://www.infobae.com/economia/", "links": ".article-title a"},
+    "Ambito": {"url": "https://www.ambito.com/economia", "links": ".title a"},
+    "Cronista": {"url": "https://www.cronista.com/ultimas-noticias/", "links": ".title a"},
 }
+SITES, SITE_ERRORS = compile_sites(URLS)
 
-def ollama_tldr(text: str) -> str:
-    r = requests.post(f"{OLLAMA}/api/generate",
-                      json={"model": MODEL,
-                            "prompt": f"Give a one sentence summary of the following news content, and only print that one sentence:\n{text}",
-                            "temperature": 0.3,
-                            "stream": False},
-                      timeout=120)
-    r.raise_for_status()
-    return r.json()["response"].strip()
-
-def fetch_news(url: str, max_n: int) -> list:
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
-    # Dependiendo del sitio, los selectores pueden variar
-    if "infobae" in url:
-        items = soup.select('.article-title a')[:max_n]
-    elif "ambito" in url:
-        items = soup.select('.title a')[:max_n]
-    elif "cronista" in url:
-        items = soup.select('.title a')[:max_n]
-    else:
-        return []
-
-    news = []
-    for item in items:
-        title = item.get_text(strip=True)
-        link = item['href']
-        summary = ""  # Algunos sitios no proporcionan un resumen directo
-        news.append({"title": title, "link": link, "summary": summary})
-    return news
-
+# Un sitio por entrada del caché: si la portada falla, la excepción evita que
+# st.cache_data guarde el error y el resto de los sitios se sigue mostrando
 @st.cache_data(ttl=3600)
+def fetch_site(source, max_n):
+    site = SITES[source]
+    rows = [{"source": source, "title": news["title"], "link": news["link"]}
+            for news in fetch_section(site, max_n)]
+    # El texto de cada nota se baja en paralelo, en el pool compartido por
+    # todos los sitios (con tope por sitio)
+    bodies = get_fetcher().fetch_all((row["link"], site.body) for row in rows)
+    return pd.DataFrame(rows, columns=["source", "title", "link"]).assign(body=bodies)
+
+
+def summarize(df):
+    """Agrega `tldr` a las notas de `df` y devuelve cuántos resúmenes fallaron.
+
+    Los resúmenes de la sesión quedan en st.session_state (por hash del
+    texto), así un rerun (p. ej. cada tecla del filtro) no vuelve a tocar ni
+    el caché ni a Ollama. Sólo se piden las notas nuevas. Las que fallaron no
+    se vuelven a pedir en primer plano: las reintenta la cola de reintentos
+    en segundo plano y acá sólo se busca si ya llegaron al caché de
+    resúmenes. Si Ollama no responde, el motor falla en el acto y las notas
+    quedan sólo con el título.
+    """
+    tldrs = st.session_state.setdefault("tldrs", {})     # hash del texto -> resumen
+    failed = st.session_state.setdefault("failed", set())
+    hashes = [hashlib.sha256(body.encode("utf-8")).hexdigest() if body else None for body in df["body"]]
+    pending = {h: body for h, body in zip(hashes, df["body"]) if h is not None and h not in tldrs}
+    for h in failed & pending.keys():
+        tldr = cached_summary(pending[h], MODEL, PROMPT, BATCH_SIZE)
+        if tldr is not None:
+            tldrs[h] = tldr
+            failed.discard(h)
+    new = {h: body for h, body in pending.items() if h not in tldrs and h not in failed}
+    if new:
+        # Ollama resume varias noticias a la vez; las notas sin texto no se le mandan
+        with SummaryEngine(MODEL, MAX_IN_FLIGHT, host=OLLAMA, prompt=PROMPT, timeout=120) as engine:
+            futures = {h: engine.submit(body) for h, body in new.items()}
+            for h, future in futures.items():
+                result = future.result()
+                if result.ok:
+                    tldrs[h] = result.text
+                else:
+                    failed.add(h)
+    column = ["No content available" if h is None else tldrs.get(h) for h in hashes]
+    return df.drop(columns="body").assign(tldr=column), sum(h in failed for h in hashes)
+
+
 def fetch_papers(sources, max_n):
-    rows = []
-    for source in sources:
-        url = URLS.get(source)
-        if url:
-            news_items = fetch_news(url, max_n)
-            for news in news_items:
-                summary = news["summary"] or "No summary available"
-                tldr = ollama_tldr(summary)
-                rows.append({
-                    "source": source,
-                    "title": news["title"],
-                    "link": news["link"],
-                    "tldr": tldr
-                })
-                time.sleep(0.1)  # Polite to Ollama
-    return pd.DataFrame(rows)
+    frames, errors = [], {}
+    sites = [source for source in sources if source not in SITE_ERRORS]
+    errors.update((source, SITE_ERRORS[source]) for source in sources if source in SITE_ERRORS)
+    if sites:
+        # Los sitios se piden a la vez: cada uno es su propia entrada del caché.
+        # Los hilos llevan el contexto de la ejecución para que st.cache_data funcione
+        with ThreadPoolExecutor(max_workers=len(sites), thread_name_prefix="sites",
+                                initializer=add_script_run_ctx, initargs=(None, get_script_run_ctx())) as pool:
+            futures = {source: pool.submit(fetch_site, source, max_n) for source in sites}
+        for source, future in futures.items():
+            try:
+                frames.append(future.result())
+            except Exception as e:
+                errors[source] = str(e)
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=["source", "title", "link", "body"])
+    return df, errors
+
+@st.cache_resource
+def warm_model():
+    # Una vez por proceso: el modelo se carga mientras se leen las páginas
+    for host in OLLAMA:
+        threading.Thread(target=warm_up, args=(MODEL, host), daemon=True, name="ollama-warmup").start()
+
+warm_model()
 
 st.sidebar.title("Radar de Economía (Ollama)")
-sel = st.sidebar.multiselect("Fuentes", list(URLS.keys()), ["Infobae", "Ambito", "Cronista"])
+sel = st.sidebar.multiselect("Fuentes", list(URLS.keys()), list(URLS.keys()))
 max_n = st.sidebar.slider("Noticias por fuente", 5, 30, 10)
 if st.sidebar.button("Actualizar ahora"):
     st.cache_data.clear()
 
-df = fetch_papers(sel, max_n)
+df, errors = fetch_papers(sel, max_n)
+df, failed = summarize(df)
+for source, error in errors.items():
+    st.sidebar.warning(f"{source}: {error}", icon=":material/warning:")
+if failed:
+    st.sidebar.warning(f"{failed} notas sin resumen: Ollama no respondió. Se reintentan en segundo plano; "
+                       "aparecen al recargar la página.",
+                       icon=":material/hourglass_empty:")
 query = st.text_input("Filtrar por palabra clave")
 if query:
-    df = df[df["tldr"].str.contains(query, case=False) | df["title"].str.contains(query, case=False)]
+    df = df[df["tldr"].str.contains(query, case=False, na=False) | df["title"].str.contains(query, case=False)]
 
 st.dataframe(df)
-csv = df.to_csv(index=False, encoding="utf-8-sig")
-st.download_button("⬇️ Descargar CSV", csv, "noticias_economia.csv")
+st.download_button("⬇️ Descargar CSV", lazy_export("csv", df), "noticias_economia.csv", mime="text/csv",
+                   on_click="ignore")
 
 st.caption("Resúmenes locales con Gemma 3 1B en Ollama — sin llaves en la nube ")
 
@@ -0,0 +1 @@
+"""Benchmarks reproducibles del pipeline con servidores locales de RSS y Ollama."""
@@ -0,0 +1,91 @@
+"""Graba los feeds de RSS_MAP como fixtures para los benchmarks.
+
+    python -m bench.record              # descarga los feeds reales
+    python -m bench.record --synthetic  # genera feeds sintéticos deterministas
+
+Los sintéticos repiten a propósito algunas notas entre fuentes (mismo link en
+Ámbito, mismo cable en varios diarios) para ejercitar la deduplicación.
+"""
+import argparse
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+import requests
+
+from bench.servers import FIXTURES_DIR
+from radar.config import RSS_MAP
+
+ITEMS = 30
+BASE_DATE = datetime(2025, 6, 2, 15, 0, tzinfo=timezone.utc)
+
+SUBJECTS = ["El dólar blue", "El riesgo país", "La inflación de mayo", "El Merval", "Las reservas del BCRA",
+            "La recaudación tributaria", "El superávit fiscal", "Las exportaciones de soja",
+            "La actividad industrial", "El consumo masivo", "Los bonos en dólares", "El crédito hipotecario"]
+VERBS = ["subió", "cayó", "se mantuvo estable", "marcó un récord", "mostró una leve mejora",
+         "registró una caída", "volvió a crecer", "se desaceleró"]
+CONTEXTS = ["tras el anuncio del Ministerio de Economía", "en una rueda de alta volatilidad",
+            "según datos del INDEC", "por la demanda de cobertura", "en medio de la incertidumbre electoral",
+            "después del acuerdo con el FMI", "impulsado por la liquidación del agro"]
+
+
+def _item(rng, tag, i, shared=None):
+    if shared is not None:
+        title, text, link = shared
+    else:
+        title = f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(CONTEXTS)}"
+        text = " ".join(f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(CONTEXTS)}."
+                        for _ in range(rng.randint(3, 8)))
+        link = f"https://example.com/{tag.lower()}/nota-{i}"
+    published = BASE_DATE - timedelta(minutes=37 * i + rng.randint(0, 20))
+    return (f"<item><title>{escape(title)}</title><link>{escape(link)}</link>"
+            f"<guid isPermaLink=\"true\">{escape(link)}</guid>"
+            f"<pubDate>{format_datetime(published)}</pubDate>"
+            f"<description>{escape(text)}</description></item>")
+
+
+def synthetic(tag: str, items: int = ITEMS) -> str:
+    rng = random.Random(tag)
+    wire = random.Random("cable")  # notas de agencia que publican varios diarios
+    wire_notes = [(f"{wire.choice(SUBJECTS)} {wire.choice(VERBS)} {wire.choice(CONTEXTS)}",
+                   " ".join(f"{wire.choice(SUBJECTS)} {wire.choice(VERBS)} {wire.choice(CONTEXTS)}."
+                            for _ in range(5)), None) for _ in range(5)]
+    ambito = random.Random("ambito")
+    out = []
+    for i in range(items):
+        shared = None
+        if tag in ("Infobae", "LaNacion", "Clarin") and i % 6 == 0:
+            title, text, _ = wire_notes[(i // 6) % len(wire_notes)]
+            shared = (title, text, f"https://example.com/{tag.lower()}/cable-{i}")
+        elif tag.startswith("Ambito") and i % 3 == 0:
+            title = f"{ambito.choice(SUBJECTS)} {ambito.choice(VERBS)} {ambito.choice(CONTEXTS)}"
+            shared = (title, title + ". " + title + ".", f"https://example.com/ambito/nota-{i}")
+        out.append(_item(rng, tag, i, shared))
+    return ('<?xml version="1.0" encoding="utf-8"?>\n<rss version="2.0"><channel>'
+            f"<title>{tag}</title><link>https://example.com/{tag.lower()}</link>"
+            f"<description>Fixture {tag}</description>\n" + "\n".join(out) + "\n</channel></rss>\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", action="store_true", help="generar feeds sintéticos en vez de descargarlos")
+    parser.add_argument("--out", default=FIXTURES_DIR)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    for tag, url in RSS_MAP.items():
+        if args.synthetic:
+            body = synthetic(tag).encode("utf-8")
+        else:
+            r = requests.get(url, timeout=30, headers={"User-Agent": "Mozilla/5.0 (compatible; filtro-noticias)"})
+            r.raise_for_status()
+            body = r.content
+        with open(os.path.join(args.out, f"{tag}.xml"), "wb") as f:
+            f.write(body)
+        print(f"{tag}: {len(body)} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Benchmark de punta a punta del pipeline contra servidores locales.
+
+    python -m bench.run --runs 3 --token-delay 0.01 --slow Clarin=1.5 --json bench.json
+    python -m bench.run --ollama-hosts 3   # reparto entre varios Ollama falsos
+
+Cada corrida usa un proceso y un directorio de datos nuevos (arranque en
+frío) y después repite el pipeline en caliente. Se informa el throughput, p50
+y p95 por etapa y el pico de memoria; con --json se guarda el reporte junto
+con el commit para comparar entre versiones.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from bench.servers import serve_ollama, serve_rss
+from radar.config import MAX_IN_FLIGHT, RSS_MAP
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "desconocido"
+
+
+def percentiles(samples) -> dict:
+    if not samples:
+        return {"n": 0, "p50": None, "p95": None}
+    values = np.asarray(samples, dtype=float)
+    return {"n": len(values), "p50": float(np.percentile(values, 50)), "p95": float(np.percentile(values, 95))}
+
+
+def parse_slow(values) -> dict:
+    slow = {}
+    for value in values:
+        tag, seconds = value.split("=")
+        slow[tag] = float(seconds)
+    return slow
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--sources", nargs="*", default=list(RSS_MAP))
+    parser.add_argument("--max-n", type=int, default=70, help="noticias totales (como el slider, repartidas por fuente)")
+    parser.add_argument("--model", default="bench:latest")
+    parser.add_argument("--max-in-flight", type=int, default=MAX_IN_FLIGHT, help="pedidos en curso por Ollama")
+    parser.add_argument("--stream", action="store_true", help="pedir los resúmenes en streaming")
+    parser.add_argument("--batch-size", type=int, default=1, help="noticias por pedido a Ollama")
+    parser.add_argument("--feed-latency", type=float, default=0.1, help="segundos por feed")
+    parser.add_argument("--slow", nargs="*", default=[], metavar="FUENTE=SEG", help="latencia propia de algunos feeds")
+    parser.add_argument("--token-delay", type=float, default=0.005, help="segundos por token en el Ollama falso")
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--overhead", type=float, default=0.02, help="segundos fijos por pedido a Ollama")
+    parser.add_argument("--parallel", type=int, default=4, help="pedidos que atiende el Ollama falso a la vez")
+    parser.add_argument("--ollama-hosts", type=int, default=1, help="Ollama falsos, cada uno en su puerto")
+    parser.add_argument("--json", help="guardar el reporte en este archivo")
+    args = parser.parse_args()
+
+    rss = serve_rss(args.feed_latency, parse_slow(args.slow))
+    ollamas = [serve_ollama(args.token_delay, args.tokens, args.overhead, args.parallel, models=(args.model,))
+               for _ in range(args.ollama_hosts)]
+    hosts = ",".join(ollama.url for ollama in ollamas)
+
+    results = []
+    for i in range(args.runs):
+        with tempfile.TemporaryDirectory(prefix="radar-bench-") as data_dir:
+            env = dict(os.environ, RADAR_DATA_DIR=data_dir, RADAR_OLLAMA=hosts)
+            payload = json.dumps({"rss": rss.url, "ollama": hosts, "sources": args.sources,
+                                  "max_n": args.max_n, "model": args.model,
+                                  "max_in_flight": args.max_in_flight, "stream": args.stream,
+                                  "batch_size": args.batch_size})
+            out = subprocess.run([sys.executable, "-m", "bench.worker", payload], cwd=ROOT, env=env,
+                                 capture_output=True, text=True, check=True).stdout
+            results.append(json.loads(out.strip().splitlines()[-1]))
+            print(f"corrida {i + 1}/{args.runs}: {results[-1]['rows']} noticias, "
+                  f"frío {results[-1]['cold_s']:.2f}s, caliente {results[-1]['warm_s']:.3f}s", file=sys.stderr)
+
+    rows = sum(r["rows"] for r in results)
+    cold = sum(r["cold_s"] for r in results)
+    report = {
+        "commit": git_commit(),
+        "config": vars(args),
+        "ollama_requests": sum(ollama.stats["requests"] for ollama in ollamas),
+        # Pedidos atendidos por cada Ollama falso: con varios, el reparto
+        "ollama_requests_per_host": [ollama.stats["requests"] for ollama in ollamas],
+        # Conexiones TCP abiertas: con keep-alive quedan muy por debajo de los pedidos
+        "connections": {"rss": rss.stats["connections"],
+                        "ollama": sum(ollama.stats["connections"] for ollama in ollamas)},
+        "throughput_articles_per_s": rows / cold if cold else None,
+        "stages": {
+            "import": percentiles([r["import_s"] for r in results]),
+            "feed": percentiles([x for r in results for x in r["feed_s"]]),
+            "summarize": percentiles([x for r in results for x in r["summarize_s"]]),
+            "sentiment": percentiles([x for r in results for x in r["sentiment_s"]]),
+            "pipeline_cold": percentiles([r["cold_s"] for r in results]),
+            "pipeline_warm": percentiles([r["warm_s"] for r in results]),
+        },
+        "peak_memory_mb": max((r["peak_mb"] for r in results if r["peak_mb"] is not None), default=None),
+        # Métricas internas del pipeline (radar.metrics) de cada corrida
+        "metrics": [r["metrics"] for r in results],
+    }
+
+    print(f"commit {report['commit']}  —  {report['throughput_articles_per_s']:.1f} noticias/s en frío, "
+          f"{report['ollama_requests']} pedidos a Ollama")
+    if len(ollamas) > 1:
+        print(f"pedidos por host: {report['ollama_requests_per_host']}")
+    print(f"conexiones: {rss.stats['connections']} al RSS ({rss.stats['requests']} pedidos), "
+          f"{report['connections']['ollama']} a Ollama")
+    print(f"{'etapa':<15}{'n':>6}{'p50 (s)':>12}{'p95 (s)':>12}")
+    for stage, p in report["stages"].items():
+        if p["n"]:
+            print(f"{stage:<15}{p['n']:>6}{p['p50']:>12.4f}{p['p95']:>12.4f}")
+    if report["peak_memory_mb"] is not None:
+        print(f"pico de memoria: {report['peak_memory_mb']:.1f} MB")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""Servidores locales que reemplazan a los feeds reales y a Ollama.
+
+- `serve_rss`: sirve `bench/fixtures/<fuente>.xml` en `/rss/<fuente>` con una
+  latencia configurable por fuente y soporte de ETag (responde 304).
+- `serve_ollama`: imita `/api/generate` (con y sin streaming, y los lotes con
+  `format: json`) y `/api/tags`, con una demora fija por token y un límite de
+  pedidos en paralelo como el de OLLAMA_NUM_PARALLEL.
+"""
+import hashlib
+import json
+import os
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_BATCH_ID = re.compile(r"^\[(\d+)\] ", re.M)
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+SENTENCE = ("El mercado cerró con alzas moderadas mientras los inversores evaluaban "
+            "los datos de inflación y la evolución de las reservas del Banco Central").split()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+def _count(stats: dict, lock, name: str):
+    with lock:
+        stats[name] += 1
+
+
+def _setup_connection(sock, stats: dict, lock):
+    # Como los servidores reales (Go pone TCP_NODELAY por defecto): sin esto,
+    # en una conexión keep-alive el cuerpo queda esperando el ACK demorado de
+    # los encabezados y cada respuesta suma ~40 ms
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    _count(stats, lock, "connections")
+
+
+def _start(handler, port: int = 0) -> _Server:
+    server = _Server(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name=f"bench-{handler.__name__}").start()
+    return server
+
+
+def serve_rss(latency: float = 0.0, per_source: dict = None, fixtures_dir: str = FIXTURES_DIR,
+              port: int = 0) -> _Server:
+    per_source = per_source or {}
+    stats = {"requests": 0, "connections": 0}
+    stats_lock = threading.Lock()
+    feeds = {}
+    for name in os.listdir(fixtures_dir):
+        if name.endswith(".xml"):
+            with open(os.path.join(fixtures_dir, name), "rb") as f:
+                body = f.read()
+            feeds[name[:-4]] = (body, '"%s"' % hashlib.sha1(body).hexdigest())
+
+    class RSSHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def setup(self):
+            super().setup()
+            _setup_connection(self.connection, stats, stats_lock)
+
+        def do_GET(self):
+            _count(stats, stats_lock, "requests")
+            tag = self.path.rsplit("/", 1)[-1]
+            if not self.path.startswith("/rss/") or tag not in feeds:
+                self.send_error(404)
+                return
+            time.sleep(per_source.get(tag, latency))
+            body, etag = feeds[tag]
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = _start(RSSHandler, port)
+    server.stats = stats
+    return server
+
+
+def serve_ollama(token_delay: float = 0.01, tokens: int = 20, overhead: float = 0.0,
+                 parallel: int = 4, models=("bench:latest",), port: int = 0) -> _Server:
+    slots = threading.BoundedSemaphore(parallel)
+    stats = {"requests": 0, "connections": 0}
+    stats_lock = threading.Lock()
+
+    class OllamaHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def setup(self):
+            super().setup()
+            _setup_connection(self.connection, stats, stats_lock)
+
+        def _json(self, payload, status=200):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/api/tags":
+                self._json({"models": [{"name": name, "model": name} for name in models]})
+            else:
+                self._json({"error": "not found"}, 404)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if self.path != "/api/generate":
+                self._json({"error": "not found"}, 404)
+                return
+            if not request.get("prompt"):
+                # Sin prompt Ollama sólo carga el modelo (precarga)
+                self._json({"model": request.get("model"), "response": "", "done": True, "done_reason": "load"})
+                return
+            _count(stats, stats_lock, "requests")
+            words = [SENTENCE[i % len(SENTENCE)] for i in range(tokens)]
+            final = {"model": request.get("model"), "response": "", "done": True,
+                     "eval_count": tokens, "eval_duration": int(tokens * token_delay * 1e9),
+                     "prompt_eval_count": len(request.get("prompt", "")) // 4}
+            with slots:
+                time.sleep(overhead)
+                if request.get("stream", True):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/x-ndjson")
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    for word in words:
+                        time.sleep(token_delay)
+                        self._chunk({"model": request.get("model"), "response": word + " ", "done": False})
+                    self._chunk(final)
+                    self.wfile.write(b"0\r\n\r\n")
+                elif request.get("format") == "json":
+                    # Lote: una oración por cada "[id] texto" del prompt
+                    ids = [int(i) for i in _BATCH_ID.findall(request.get("prompt", ""))]
+                    time.sleep(token_delay * tokens * len(ids))
+                    summaries = [{"id": i, "resumen": " ".join(words) + "."} for i in ids]
+                    self._json(dict(final, response=json.dumps({"resumenes": summaries}),
+                                    eval_count=tokens * len(ids),
+                                    eval_duration=int(tokens * len(ids) * token_delay * 1e9)))
+                else:
+                    time.sleep(token_delay * tokens)
+                    self._json(dict(final, response=" ".join(words) + "."))
+
+        def _chunk(self, payload):
+            data = (json.dumps(payload) + "\n").encode("utf-8")
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+    server = _start(OllamaHandler, port)
+    server.stats = stats
+    return server
@@ -0,0 +1,79 @@
+"""Una corrida del benchmark, en un proceso limpio.
+
+La lanza `bench.run` con RADAR_DATA_DIR apuntando a un directorio vacío, así
+cada corrida arranca sin caché, y devuelve las mediciones como JSON.
+"""
+import json
+import sys
+import time
+
+
+def peak_memory_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    args = json.loads(sys.argv[1])
+
+    start = time.perf_counter()
+    import radar.feeds
+    from radar.metrics import registry
+    from radar.pipeline import fetch_papers
+    from radar.sentiment import analyze_batch
+    import_s = time.perf_counter() - start
+
+    # Tiempo de cada feed: se envuelve fetch_feed, que es lo que llama iter_feeds
+    feed_s = []
+    fetch_feed = radar.feeds.fetch_feed
+
+    def timed_fetch(*args, **kwargs):
+        t = time.perf_counter()
+        try:
+            return fetch_feed(*args, **kwargs)
+        finally:
+            feed_s.append(time.perf_counter() - t)
+
+    radar.feeds.fetch_feed = timed_fetch
+
+    rss_map = {tag: f"{args['rss']}/rss/{tag}" for tag in args["sources"]}
+    feeds = tuple(rss_map)
+    kwargs = dict(rss_map=rss_map, host=args["ollama"].split(","), max_in_flight=args["max_in_flight"],
+                  batch_size=args["batch_size"])
+    if args["stream"]:
+        kwargs["on_progress"] = lambda rows: None
+
+    start = time.perf_counter()
+    df = fetch_papers(feeds, args["max_n"], args["model"], **kwargs)
+    cold_s = time.perf_counter() - start
+    cold_feed_s = list(feed_s)
+
+    start = time.perf_counter()
+    fetch_papers(feeds, args["max_n"], args["model"], **kwargs)
+    warm_s = time.perf_counter() - start
+
+    sentiment_s = []
+    for _ in range(5):
+        t = time.perf_counter()
+        analyze_batch(df["tldr"])
+        sentiment_s.append(time.perf_counter() - t)
+
+    print(json.dumps({
+        "rows": len(df),
+        "import_s": import_s,
+        "cold_s": cold_s,
+        "warm_s": warm_s,
+        "feed_s": cold_feed_s,
+        "summarize_s": [float(x) for x in df["latency"] if x and x > 0],
+        "sentiment_s": sentiment_s,
+        "peak_mb": peak_memory_mb(),
+        "metrics": registry.snapshot(),
+    }))
+
+
+if __name__ == "__main__":
+    main()
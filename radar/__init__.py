@@ -0,0 +1 @@
+"""Núcleo compartido por las apps de noticias económicas."""
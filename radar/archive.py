@@ -0,0 +1,172 @@
+"""Archivo histórico en Parquet, particionado por fecha y fuente.
+
+Cada entrada procesada se agrega a `data/archive/fecha=AAAA-MM-DD/source=X/`.
+Las consultas por rango de fechas sólo abren las particiones que tocan
+(predicate pushdown de pyarrow), así que el archivo puede crecer a meses de
+noticias sin volver a descargar ni resumir nada.
+
+Cada corrida agrega un archivo chico por partición; `compact` reescribe en
+uno solo cada partición de un día ya terminado, para que las lecturas no
+tengan que abrir miles de archivos.
+"""
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from radar.config import ARGENTINA_TZ, DATA_DIR
+from radar.metrics import registry
+from radar.sentiment import analyze_batch
+
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+
+SCHEMA = pa.schema([
+    ("model", pa.string()),
+    ("key", pa.string()),
+    ("published", pa.timestamp("s", tz="UTC")),
+    ("published_text", pa.string()),
+    ("title", pa.string()),
+    ("link", pa.string()),
+    ("tldr", pa.string()),
+    ("sentiment", pa.string()),
+    ("latency", pa.float64()),
+    ("ingested", pa.float64()),
+    ("fecha", pa.string()),
+    ("source", pa.string()),
+])
+# Columnas que devuelve `read_range`, las mismas que el DataFrame del pipeline
+COLUMNS = ["key", "source", "date", "published_text", "title", "link", "tldr", "sentiment", "latency"]
+# Lo que se guarda en cada archivo: las columnas de partición van en la ruta
+FILE_SCHEMA = pa.schema([field for field in SCHEMA if field.name not in ("fecha", "source")])
+PARTITIONING = ds.partitioning(pa.schema([("fecha", pa.string()), ("source", pa.string())]), flavor="hive")
+
+_lock = threading.Lock()
+READ_ATTEMPTS = 3  # lecturas que se reintentan si otro proceso compacta en el medio
+
+
+def partition_date(published) -> str:
+    # Día en hora de Argentina; sin fecha de publicación se usa la de ingesta
+    ts = published if published is not None else time.time()
+    return datetime.fromtimestamp(ts, ARGENTINA_TZ).strftime("%Y-%m-%d")
+
+
+def append(model: str, rows, root: str = ARCHIVE_DIR):
+    rows = list(rows)
+    if not rows:
+        return
+    now = time.time()
+    table = pa.Table.from_pylist([{
+        "model": model,
+        "key": row["key"],
+        "published": int(row["published"]) if row.get("published") is not None else None,
+        "published_text": row.get("published_text"),
+        "title": row.get("title"),
+        "link": row.get("link"),
+        "tldr": row.get("tldr"),
+        "sentiment": row.get("sentiment"),
+        "latency": row.get("latency"),
+        "ingested": now,
+        "fecha": partition_date(row.get("published")),
+        "source": row["source"],
+    } for row in rows], schema=SCHEMA)
+    with _lock:
+        pq.write_to_dataset(table, root, partitioning=PARTITIONING,
+                            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+                            existing_data_behavior="overwrite_or_ignore")
+
+
+def compact(root: str = ARCHIVE_DIR, before: str = None) -> int:
+    """Une en un archivo cada partición con varios archivos de un día anterior a `before`.
+
+    Por defecto `before` es hoy en hora de Argentina: el día en curso sigue
+    recibiendo archivos nuevos en cada corrida. De cada entrada queda sólo la
+    versión más reciente. Devuelve cuántas particiones se compactaron.
+    """
+    if not os.path.isdir(root):
+        return 0
+    before = before or datetime.now(ARGENTINA_TZ).strftime("%Y-%m-%d")
+    compacted = 0
+    with _lock:
+        for day in sorted(os.listdir(root)):
+            if not day.startswith("fecha=") or day[len("fecha="):] >= before:
+                continue
+            for source in os.listdir(os.path.join(root, day)):
+                if _compact_partition(os.path.join(root, day, source)):
+                    compacted += 1
+    return compacted
+
+
+def _compact_partition(path: str) -> bool:
+    files = [os.path.join(path, name) for name in os.listdir(path) if name.endswith(".parquet")]
+    if len(files) < 2:
+        return False
+    try:
+        df = ds.dataset(files, schema=FILE_SCHEMA, format="parquet").to_table().to_pandas()
+    except FileNotFoundError:
+        # Otro proceso la está compactando; queda para la próxima corrida
+        return False
+    df = (df.sort_values("ingested", kind="stable")
+            .drop_duplicates(subset=["model", "key"], keep="last")
+            .sort_values(["model", "published"], kind="stable"))
+    name = f"part-{uuid.uuid4().hex}-0.parquet"
+    # Se escribe con un prefijo que pyarrow ignora al leer y recién después se
+    # renombra: una lectura en paralelo nunca ve un archivo a medias
+    tmp = os.path.join(path, "." + name)
+    pq.write_table(pa.Table.from_pandas(df, schema=FILE_SCHEMA, preserve_index=False), tmp)
+    os.replace(tmp, os.path.join(path, name))
+    for file in files:
+        try:
+            os.remove(file)
+        except FileNotFoundError:
+            pass
+    return True
+
+
+def backfill(store, root: str = ARCHIVE_DIR):
+    """La primera vez, archiva lo que ya estaba en el registro de entradas."""
+    if os.path.isdir(root):
+        return
+    for model, rows in store.rows_by_model().items():
+        append(model, rows, root)
+
+
+def read_range(model: str, start, end, sources=None, root: str = ARCHIVE_DIR) -> pd.DataFrame:
+    """Entradas de `model` publicadas entre `start` y `end` (fechas, inclusive).
+
+    Devuelve las mismas columnas que `fetch_papers`, con `date` en hora de
+    Argentina y el sentimiento recalculado en lote.
+    """
+    if not os.path.isdir(root):
+        return pd.DataFrame(columns=COLUMNS)
+    condition = ((ds.field("fecha") >= start.isoformat()) & (ds.field("fecha") <= end.isoformat())
+                 & (ds.field("model") == model))
+    if sources is not None:
+        condition &= ds.field("source").isin(list(sources))
+    with registry.timer("archive_read", model=model):
+        for attempt in range(READ_ATTEMPTS):
+            # `_lock` no alcanza a las otras apps: si una compacta entre el listado
+            # de archivos y la lectura, se vuelve a listar (el archivo compactado
+            # se escribe antes de borrar los viejos, así que no se pierde nada)
+            dataset = ds.dataset(root, schema=SCHEMA, format="parquet", partitioning=PARTITIONING)
+            try:
+                df = dataset.to_table(filter=condition).to_pandas()
+                break
+            except FileNotFoundError:
+                if attempt == READ_ATTEMPTS - 1:
+                    raise
+                registry.incr("archive_read_retries", model=model)
+    # Una misma entrada puede haberse archivado más de una vez: queda la última
+    df = (df.sort_values("ingested", kind="stable")
+            .drop_duplicates(subset=["source", "key"], keep="last")
+            .sort_values("published", ascending=False, kind="stable")
+            .reset_index(drop=True))
+    df["date"] = df["published"].dt.tz_convert(ARGENTINA_TZ)
+    with registry.timer("sentiment"):
+        df["sentiment"] = analyze_batch(df["tldr"])
+    return df[COLUMNS]
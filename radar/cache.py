@@ -0,0 +1,91 @@
+"""Caché persistente de resúmenes, direccionada por contenido.
+
+La clave es (modelo, plantilla del prompt y presupuesto de texto, hash del
+texto; ver `ollama.prompt_key`), así una noticia que ya se resumió no vuelve
+a mandarse a Ollama aunque se limpie el caché de Streamlit o la use otra de
+las apps.
+"""
+import hashlib
+import threading
+import time
+
+from radar.db import connect
+
+MAX_ENTRIES = 50_000           # se descartan los menos usados por encima de esto
+MAX_AGE = 30 * 24 * 3600       # segundos sin usarse antes de descartarse
+EVICT_EVERY = 500              # cada cuántas escrituras se corre la limpieza
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    tldr TEXT NOT NULL,
+    created REAL NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS summaries_used ON summaries(used);
+"""
+
+
+def cache_key(model: str, prompt: str, text: str) -> str:
+    h = hashlib.sha256()
+    for part in (model, prompt, text):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class SummaryCache:
+    def __init__(self, path: str = None, max_entries: int = MAX_ENTRIES, max_age: float = MAX_AGE):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = connect(path)
+        self._conn.executescript(_SCHEMA)
+        self.evict()
+
+    def get(self, model: str, prompt: str, text: str):
+        key = cache_key(model, prompt, text)
+        with self._lock:
+            row = self._conn.execute("SELECT tldr FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE summaries SET used = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def put(self, model: str, prompt: str, text: str, tldr: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, model, tldr, created, used) VALUES (?, ?, ?, ?, ?)",
+                (cache_key(model, prompt, text), model, tldr, now, now))
+            self._writes += 1
+            due = self._writes % EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM summaries WHERE used < ?", (time.time() - self.max_age,))
+            self._conn.execute(
+                "DELETE FROM summaries WHERE key IN ("
+                " SELECT key FROM summaries ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,))
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_cache() -> SummaryCache:
+    """Caché compartido del proceso; se abre la primera vez que se usa."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SummaryCache()
+        return _shared
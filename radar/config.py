@@ -0,0 +1,32 @@
+"""Configuración compartida por todas las apps."""
+import os
+
+import pytz
+
+# Uno o varios servidores de Ollama separados por coma; los resúmenes se reparten entre ellos
+OLLAMA_HOSTS = tuple(host.strip().rstrip("/") for host in
+                     os.environ.get("RADAR_OLLAMA", "http://localhost:11434").split(",") if host.strip())
+OLLAMA = OLLAMA_HOSTS[0]
+MAX_IN_FLIGHT = int(os.environ.get("RADAR_MAX_IN_FLIGHT", "4"))  # resúmenes pedidos a cada Ollama en simultáneo
+# Noticias por pedido a Ollama (1 = un pedido por noticia); ver SummaryEngine
+BATCH_SIZE = int(os.environ.get("RADAR_BATCH_SIZE", "1"))
+# Cuánto mantiene Ollama el modelo cargado después del último pedido
+KEEP_ALIVE = os.environ.get("RADAR_KEEP_ALIVE", "30m")
+# Tope de tokens (aproximados) del texto de cada noticia que se manda a resumir
+INPUT_TOKENS = int(os.environ.get("RADAR_INPUT_TOKENS", "400"))
+REFRESH_INTERVAL = float(os.environ.get("RADAR_REFRESH_INTERVAL", "1800"))  # segundos entre refrescos
+
+RSS_MAP = {
+    "Infobae": "https://www.infobae.com/feeds/rss/economia.xml",
+    "AmbitoFin": "https://www.ambito.com/rss/finanzas.xml",
+    "AmbitoEcon": "https://www.ambito.com/rss/economia.xml",
+    "CronistaFin": "https://www.cronista.com/files/rss/finanzas-mercados.xml",
+    "CronistaEcon": "https://www.cronista.com/files/rss/economia-politica.xml",
+    "LaNacion": "https://www.lanacion.com.ar/rss/economia.xml",
+    "Clarin":  "https://www.clarin.com/rss/economia",
+}
+
+ARGENTINA_TZ = pytz.timezone('America/Argentina/Buenos_Aires')
+
+DATA_DIR = os.environ.get("RADAR_DATA_DIR",
+                          os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
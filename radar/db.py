@@ -0,0 +1,17 @@
+"""Base SQLite compartida por todas las apps (resúmenes, entradas, etc.)."""
+import os
+import sqlite3
+
+from radar.config import DATA_DIR
+
+DB_PATH = os.path.join(DATA_DIR, "radar.sqlite3")
+
+
+def connect(path: str = None) -> sqlite3.Connection:
+    path = path or DB_PATH
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # autocommit + WAL: varias apps (procesos) pueden leer y escribir a la vez
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
@@ -0,0 +1,74 @@
+"""Detección de noticias repetidas entre fuentes.
+
+La misma nota suele aparecer en AmbitoFin y AmbitoEcon (mismo link) o como
+cable de agencia en varios diarios con pequeñas diferencias. Las exactas se
+detectan por link/guid y las casi iguales por SimHash de título + resumen.
+"""
+import hashlib
+import re
+import unicodedata
+
+BITS = 64
+MAX_DISTANCE = 3   # bits distintos para considerar dos textos casi iguales
+SHINGLE = 3        # palabras por shingle
+
+_WORD = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def simhash(text: str) -> int:
+    words = _WORD.findall(normalize(text))
+    shingles = [" ".join(words[i:i + SHINGLE]) for i in range(max(1, len(words) - SHINGLE + 1))]
+    weights = [0] * BITS
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(BITS) if weights[bit] > 0)
+
+
+class Deduper:
+    """Asigna cada noticia a un grupo de repetidas.
+
+    Los hashes se indexan en MAX_DISTANCE + 1 bandas: dos hashes a distancia
+    <= MAX_DISTANCE coinciden por completo en al menos una banda, así que sólo
+    se comparan los candidatos que comparten alguna.
+    """
+
+    def __init__(self, max_distance: int = MAX_DISTANCE):
+        self.max_distance = max_distance
+        self._bands = max_distance + 1
+        self._width = BITS // self._bands
+        self._mask = (1 << self._width) - 1
+        self._by_id = {}                                  # link o guid -> grupo
+        self._index = [{} for _ in range(self._bands)]    # banda -> valor -> [(hash, grupo)]
+
+    def _band_values(self, h: int):
+        return [(h >> (i * self._width)) & self._mask for i in range(self._bands)]
+
+    def find(self, ids, text: str):
+        """Grupo de una noticia ya vista igual o parecida, o None."""
+        for ident in ids:
+            if ident and ident in self._by_id:
+                return self._by_id[ident]
+        if not text.strip():
+            return None
+        h = simhash(text)
+        for band, value in enumerate(self._band_values(h)):
+            for other, group in self._index[band].get(value, ()):
+                if (h ^ other).bit_count() <= self.max_distance:
+                    return group
+        return None
+
+    def add(self, ids, text: str, group):
+        for ident in ids:
+            if ident:
+                self._by_id.setdefault(ident, group)
+        if text.strip():
+            h = simhash(text)
+            for band, value in enumerate(self._band_values(h)):
+                self._index[band].setdefault(value, []).append((h, group))
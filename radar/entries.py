@@ -0,0 +1,173 @@
+"""Registro de entradas ya procesadas, para ingerir sólo las noticias nuevas.
+
+Cada entrada se identifica por su guid (o link) y se guarda por modelo junto
+con su resumen y sentimiento. Por fuente se lleva una marca de agua con la
+fecha de publicación más nueva vista: lo publicado después de esa marca es
+nuevo sin necesidad de consultarlo.
+"""
+import calendar
+import threading
+import time
+
+from radar.db import connect
+
+_ENTRIES = """
+CREATE TABLE IF NOT EXISTS entries (
+    model TEXT NOT NULL,
+    key TEXT NOT NULL,
+    source TEXT NOT NULL,
+    published REAL,
+    published_text TEXT,
+    title TEXT,
+    link TEXT,
+    summary TEXT,
+    tldr TEXT,
+    sentiment TEXT,
+    latency REAL,
+    ingested REAL NOT NULL,
+    PRIMARY KEY (model, source, key)
+)"""
+_SCHEMA = _ENTRIES + """;
+CREATE TABLE IF NOT EXISTS watermarks (
+    model TEXT NOT NULL,
+    source TEXT NOT NULL,
+    published REAL NOT NULL,
+    PRIMARY KEY (model, source)
+);
+"""
+
+COLUMNS = ("key", "source", "published", "published_text", "title", "link",
+           "summary", "tldr", "sentiment", "latency")
+
+
+def _migrate(conn):
+    """Pasa la tabla `entries` anterior (clave (model, key)) a la clave actual.
+
+    Con la clave vieja, la misma nota en dos fuentes se pisaba y una de las
+    dos volvía a tomarse como nueva en cada refresco.
+    """
+    def old_key():
+        pk = [c[1] for c in conn.execute("PRAGMA table_info(entries)") if c[5]]
+        return bool(pk) and "source" not in pk
+
+    if not old_key():
+        return
+    columns = ", ".join(("model", "ingested") + COLUMNS)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Otro proceso pudo haber migrado mientras se esperaba el bloqueo
+        if not old_key():
+            conn.execute("COMMIT")
+            return
+        conn.execute("ALTER TABLE entries RENAME TO entries_old")
+        conn.execute(_ENTRIES)
+        conn.execute(f"INSERT OR IGNORE INTO entries ({columns}) SELECT {columns} FROM entries_old")
+        conn.execute("DROP TABLE entries_old")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def entry_key(e) -> str:
+    return e.get("id") or e.get("link") or e.get("title", "")
+
+
+def entry_published(e):
+    """Fecha de publicación en segundos epoch (UTC), o None."""
+    if e.get("published_parsed"):
+        # published_parsed ya viene en UTC: timegm, no mktime (que asume hora local)
+        return float(calendar.timegm(e["published_parsed"]))
+    return None
+
+
+class EntryStore:
+    def __init__(self, path: str = None):
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        _migrate(self._conn)
+        self._conn.executescript(_SCHEMA)
+
+    def watermark(self, model: str, source: str):
+        with self._lock:
+            row = self._conn.execute("SELECT published FROM watermarks WHERE model = ? AND source = ?",
+                                     (model, source)).fetchone()
+        return row[0] if row else None
+
+    def lookup(self, model: str, source: str, keys) -> dict:
+        """Filas guardadas de `source` para las claves dadas, como {key: row}."""
+        keys = list(keys)
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                cur = self._conn.execute(
+                    f"SELECT {', '.join(COLUMNS)} FROM entries"
+                    f" WHERE model = ? AND source = ? AND key IN ({marks})",
+                    (model, source, *chunk))
+                for values in cur:
+                    found[values[0]] = dict(zip(COLUMNS, values))
+        return found
+
+    def rows_by_model(self) -> dict:
+        """Todas las filas guardadas, agrupadas por modelo."""
+        grouped = {}
+        with self._lock:
+            cur = self._conn.execute(f"SELECT model, {', '.join(COLUMNS)} FROM entries")
+            for model, *values in cur:
+                grouped.setdefault(model, []).append(dict(zip(COLUMNS, values)))
+        return grouped
+
+    def add(self, model: str, rows):
+        rows = list(rows)
+        if not rows:
+            return
+        now = time.time()
+        marks = {}
+        for row in rows:
+            if row.get("published") is not None:
+                marks[row["source"]] = max(marks.get(row["source"], 0), row["published"])
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO entries (model, {', '.join(COLUMNS)}, ingested)"
+                    f" VALUES (?, {', '.join('?' * len(COLUMNS))}, ?)",
+                    [(model, *(row.get(c) for c in COLUMNS), now) for row in rows])
+                self._conn.executemany(
+                    "INSERT INTO watermarks (model, source, published) VALUES (?, ?, ?)"
+                    " ON CONFLICT (model, source) DO UPDATE SET published = MAX(published, excluded.published)",
+                    [(model, source, published) for source, published in marks.items()])
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+
+def split_new(store: EntryStore, model: str, source: str, entries) -> list:
+    """Clasifica las entradas de un feed, en el orden del feed.
+
+    Devuelve (key, entrada, fila guardada) donde la fila es None si la entrada
+    es nueva. Lo publicado después de la marca de agua no se consulta.
+    """
+    mark = store.watermark(model, source)
+    items = []
+    for e in entries:
+        published = entry_published(e)
+        known = mark is None or published is None or published <= mark
+        items.append((entry_key(e), e, known))
+    stored = store.lookup(model, source, [key for key, _, known in items if known])
+    return [(key, e, stored.get(key)) for key, e, _ in items]
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_store() -> EntryStore:
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = EntryStore()
+        return _shared
@@ -0,0 +1,87 @@
+"""Exportación de las noticias a CSV, Excel y Word.
+
+Las descargas de la interfaz no generan nada en cada rerun: `lazy_export`
+devuelve una función que arma el archivo recién cuando el usuario lo pide, y
+guarda el resultado por hash del DataFrame para reutilizarlo mientras los
+datos filtrados no cambien.
+"""
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+from docx import Document
+
+MEMO_ENTRIES = 8  # exportaciones guardadas (las más recientes)
+DATE_FORMAT = "%d-%m-%Y %H:%M"  # fechas en Word; CSV y Excel las guardan tipadas
+
+_memo = OrderedDict()  # (formato, hash del DataFrame) -> bytes
+_memo_lock = threading.Lock()
+
+
+def to_csv(df):
+    return df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig")
+
+
+def to_excel(df):
+    # Excel no admite zonas horarias: las fechas quedan en su hora local
+    aware = [col for col in df.columns if isinstance(df[col].dtype, pd.DatetimeTZDtype)]
+    if aware:
+        df = df.assign(**{col: df[col].dt.tz_localize(None) for col in aware})
+    output = io.BytesIO()
+    # constant_memory: xlsxwriter escribe fila por fila en vez de guardar todas las celdas
+    with pd.ExcelWriter(output, engine='xlsxwriter', engine_kwargs={"options": {"constant_memory": True}}) as writer:
+        df.to_excel(writer, index=False, sheet_name='Noticias')
+    return output.getvalue()
+
+
+def to_word(df):
+    doc = Document()
+    doc.add_heading('Noticias de Economía', 0)
+    columns = ["title", "source", "date", "tldr", "sentiment", "link"]
+    df = df[columns]
+    if pd.api.types.is_datetime64_any_dtype(df["date"]):
+        df = df.assign(date=df["date"].dt.strftime(DATE_FORMAT).fillna("Fecha no disponible"))
+    for title, source, date, tldr, sentiment, link in df.itertuples(index=False, name=None):
+        doc.add_heading(title, level=1)
+        doc.add_paragraph(f"Fuente: {source}")
+        doc.add_paragraph(f"Fecha: {date}")
+        doc.add_paragraph(f"Resumen: {tldr}")
+        doc.add_paragraph(f"Sentimiento: {sentiment}")
+        doc.add_paragraph(f"Enlace: {link}")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+EXPORTERS = {"csv": to_csv, "xlsx": to_excel, "docx": to_word}
+
+
+def frame_digest(df) -> str:
+    """Hash del contenido (columnas y valores) de `df`."""
+    digest = hashlib.sha1(repr(list(df.columns)).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def lazy_export(kind: str, df):
+    """Función sin argumentos que devuelve `df` exportado como `kind` (csv, xlsx o docx).
+
+    Pensada para `st.download_button(data=...)`: sólo corre al descargar, y
+    el mismo DataFrame no se vuelve a exportar.
+    """
+    def build():
+        key = (kind, frame_digest(df))
+        with _memo_lock:
+            if key in _memo:
+                _memo.move_to_end(key)
+                return _memo[key]
+        data = EXPORTERS[kind](df)
+        with _memo_lock:
+            _memo[key] = data
+            while len(_memo) > MEMO_ENTRIES:
+                _memo.popitem(last=False)
+        return data
+
+    return build
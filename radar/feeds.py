@@ -0,0 +1,75 @@
+"""Descarga de feeds RSS en paralelo."""
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import feedparser
+
+from radar.http import get_session
+from radar.metrics import registry
+
+FEED_TIMEOUT = 10  # segundos por request (conexión / lectura)
+FEED_WORKERS = 8   # máximo de feeds descargándose a la vez
+
+# url -> (etag, last_modified, parsed) de la última descarga completa
+_validators = {}
+_validators_lock = threading.Lock()
+
+
+def empty_feed(error) -> feedparser.FeedParserDict:
+    # Mismo formato que devuelve feedparser cuando no puede leer una URL
+    return feedparser.FeedParserDict(entries=[], bozo=1, bozo_exception=error)
+
+
+def fetch_feed(url: str, timeout: float = FEED_TIMEOUT, source: str = None) -> feedparser.FeedParserDict:
+    """Descarga y parsea un feed con GET condicional (ETag / Last-Modified).
+
+    Si el servidor responde 304 se devuelven las entradas ya parseadas la vez
+    anterior, sin volver a bajar ni parsear el XML. `source` sólo etiqueta
+    las métricas (por defecto, la URL).
+    """
+    source = source or url
+    headers = {}
+    with _validators_lock:
+        previous = _validators.get(url)
+    if previous is not None:
+        etag, modified, _ = previous
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+
+    with registry.timer("feed_download", source=source):
+        r = get_session().get(url, timeout=timeout, headers=headers)
+    if r.status_code == 304 and previous is not None:
+        registry.incr("feed_not_modified", source=source)
+        return feedparser.FeedParserDict(previous[2], status=304)
+    r.raise_for_status()
+
+    with registry.timer("feed_parse", source=source):
+        parsed = feedparser.parse(r.content, response_headers=r.headers)
+    parsed["status"] = r.status_code
+    etag, modified = r.headers.get("ETag"), r.headers.get("Last-Modified")
+    if (etag or modified) and parsed.entries:
+        with _validators_lock:
+            _validators[url] = (etag, modified, parsed)
+    return parsed
+
+
+def iter_feeds(tags, rss_map, max_workers: int = FEED_WORKERS, timeout: float = FEED_TIMEOUT):
+    """Devuelve (tag, parsed) a medida que cada feed está listo.
+
+    Un feed lento o caído no frena al resto: si falla, se entrega vacío.
+    """
+    tags = list(tags)
+    if not tags:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tags))) as pool:
+        futures = {pool.submit(fetch_feed, rss_map[tag], timeout, tag): tag for tag in tags}
+        for future in as_completed(futures):
+            tag = futures[future]
+            try:
+                parsed = future.result()
+            except Exception as e:
+                registry.incr("feed_errors", source=tag)
+                parsed = empty_feed(e)
+            yield tag, parsed
@@ -0,0 +1,66 @@
+"""Sesión HTTP compartida, con conexiones persistentes.
+
+Feeds, Ollama, Telegram y los sitios scrapeados usan la misma sesión: cada
+host mantiene abiertas hasta `PER_HOST` conexiones (keep-alive), así el
+TCP/TLS se negocia una vez y no en cada noticia.
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from radar.config import MAX_IN_FLIGHT
+
+USER_AGENT = "Mozilla/5.0 (compatible; filtro-noticias)"
+CONNECT_TIMEOUT = 3.05  # segundos para abrir la conexión; la lectura la fija cada llamada
+READ_TIMEOUT = 30
+HOSTS = 16  # hosts distintos con conexiones guardadas
+# Conexiones simultáneas por host: alcanza para los pedidos en paralelo a Ollama
+PER_HOST = int(os.environ.get("RADAR_HTTP_PER_HOST", max(8, MAX_IN_FLIGHT)))
+
+# Reintentos ante errores de conexión y respuestas transitorias. Los POST
+# sólo se reintentan si no llegaron a enviarse (errores de conexión): volver
+# a pedir un resumen a Ollama repetiría todo el trabajo.
+RETRY = Retry(total=3, connect=3, read=1, status=2, backoff_factor=0.3,
+              status_forcelist=(429, 502, 503, 504), allowed_methods=("GET", "HEAD"),
+              respect_retry_after_header=True, raise_on_status=False)
+
+
+class Session(requests.Session):
+    """`requests.Session` con timeout por defecto.
+
+    Un `timeout` numérico se toma como el de lectura; la conexión usa
+    `CONNECT_TIMEOUT` (o menos, si la lectura es más corta). `timeout=None`
+    espera sin límite, igual que en `requests`.
+    """
+
+    def request(self, method, url, timeout=READ_TIMEOUT, **kwargs):
+        if timeout is not None and not isinstance(timeout, tuple):
+            timeout = (min(CONNECT_TIMEOUT, timeout), timeout)
+        return super().request(method, url, timeout=timeout, **kwargs)
+
+
+def new_session(per_host: int = PER_HOST, retry: Retry = RETRY) -> Session:
+    session = Session()
+    session.headers["User-Agent"] = USER_AGENT
+    # pool_block: si un host ya tiene `per_host` conexiones en uso, el pedido
+    # espera una libre en vez de abrir (y descartar) conexiones de más
+    adapter = HTTPAdapter(pool_connections=HOSTS, pool_maxsize=per_host, pool_block=True, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> Session:
+    """Sesión compartida por todo el proceso (se crea al primer uso)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = new_session()
+        return _session
@@ -0,0 +1,104 @@
+"""Métricas del pipeline: tiempos por etapa y contadores.
+
+Cada medición lleva etiquetas (fuente, modelo, ...). El registro del proceso
+se muestra en el panel de diagnóstico de la interfaz y se vuelca a
+`data/metrics.json` después de cada corrida del pipeline.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+from radar.config import DATA_DIR
+
+METRICS_PATH = os.path.join(DATA_DIR, "metrics.json")
+SAMPLES = 500  # mediciones recientes que se guardan por serie para p50/p95
+
+log = logging.getLogger(__name__)
+
+
+def _key(name, labels) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timers = {}    # (etapa, etiquetas) -> {"count", "total", "max", "samples"}
+        self._counters = {}  # (nombre, etiquetas) -> valor
+
+    def observe(self, stage: str, seconds: float, **labels):
+        with self._lock:
+            timer = self._timers.get(_key(stage, labels))
+            if timer is None:
+                timer = self._timers[_key(stage, labels)] = {
+                    "count": 0, "total": 0.0, "max": 0.0, "samples": deque(maxlen=SAMPLES)}
+            timer["count"] += 1
+            timer["total"] += seconds
+            timer["max"] = max(timer["max"], seconds)
+            timer["samples"].append(seconds)
+
+    @contextmanager
+    def timer(self, stage: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def incr(self, name: str, value: float = 1, **labels):
+        with self._lock:
+            key = _key(name, labels)
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            timers = [(name, dict(labels), dict(t, samples=list(t["samples"])))
+                      for (name, labels), t in self._timers.items()]
+            counters = [(name, dict(labels), value) for (name, labels), value in self._counters.items()]
+        return {
+            "updated": time.time(),
+            "timers": [{
+                "stage": name, "labels": labels, "count": t["count"], "total_s": t["total"],
+                "mean_s": t["total"] / t["count"], "max_s": t["max"],
+                "p50_s": float(np.percentile(t["samples"], 50)),
+                "p95_s": float(np.percentile(t["samples"], 95)),
+            } for name, labels, t in timers],
+            "counters": [{"name": name, "labels": labels, "value": value} for name, labels, value in counters],
+        }
+
+    def write(self, path: str = METRICS_PATH) -> bool:
+        """Vuelca el registro como JSON (escritura atómica).
+
+        Un error al escribir se registra en el log y no se propaga: las
+        métricas no pueden hacer fallar la corrida que miden.
+        """
+        tmp = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Archivo temporal propio de cada llamada: dos hilos pueden volcar a la vez
+            fd, tmp = tempfile.mkstemp(prefix=".metrics-", suffix=".tmp", dir=os.path.dirname(path))
+            with os.fdopen(fd, "w") as f:
+                json.dump(self.snapshot(), f, indent=1)
+            os.replace(tmp, path)
+            return True
+        except OSError:
+            log.exception("No se pudieron escribir las métricas en %s", path)
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+            return False
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+
+# Registro del proceso, compartido por todos los módulos
+registry = Metrics()
@@ -0,0 +1,35 @@
+"""Notificaciones por correo y Telegram.
+
+Las funciones lanzan la excepción si el envío falla; mostrar el resultado
+al usuario queda a cargo de la interfaz.
+"""
+import smtplib
+import ssl
+
+from radar.http import get_session
+
+EMAIL_SENDER = "tucorreo@gmail.com"
+EMAIL_RECEIVER = "destinatario@gmail.com"
+EMAIL_PASSWORD = "tu_clave_de_app"
+
+TELEGRAM_BOT_TOKEN = "TU_BOT_TOKEN"
+TELEGRAM_CHAT_ID = "TU_CHAT_ID"
+
+
+def send_email(subject, body, sender=EMAIL_SENDER, receiver=EMAIL_RECEIVER, password=EMAIL_PASSWORD):
+    message = f"Subject: {subject}\n\n{body}"
+    context = ssl.create_default_context()
+    with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=context) as server:
+        server.login(sender, password)
+        # El cuerpo trae acentos: se envía en UTF-8
+        server.sendmail(sender, receiver, message.encode("utf-8"))
+
+
+def send_telegram(message, bot_token=TELEGRAM_BOT_TOKEN, chat_id=TELEGRAM_CHAT_ID) -> bool:
+    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+    # POST: la sesión compartida reintenta los GET ante 502/503/504 y el
+    # mensaje podría publicarse dos veces; los POST sólo se reintentan si no
+    # llegaron a enviarse
+    data = {"chat_id": chat_id, "text": message}
+    response = get_session().post(url, data=data, timeout=10)
+    return response.ok
@@ -0,0 +1,737 @@
+"""Cliente de Ollama para generar los resúmenes de las noticias."""
+import heapq
+import itertools
+import json
+import logging
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+from radar.cache import get_cache
+from radar.config import BATCH_SIZE, INPUT_TOKENS, KEEP_ALIVE, MAX_IN_FLIGHT, OLLAMA, OLLAMA_HOSTS
+from radar.http import get_session, new_session
+from radar.metrics import registry
+
+PROMPT = "Genera un resumen de una oración del siguiente contenido de noticias e imprima solo esa oración.:\n{text}"
+TIMEOUT = 60
+
+# Varias noticias en un solo pedido: la instrucción se procesa una vez por lote
+BATCH_PROMPT = ("Para cada noticia de la lista, genera un resumen de una oración. Responde sólo con JSON "
+                "con este formato: {{\"resumenes\": [{{\"id\": 1, \"resumen\": \"...\"}}]}}, "
+                "un elemento por noticia y con su mismo id.\n\n{items}")
+BATCH_WAIT = 0.25  # segundos que se espera a completar un lote antes de mandarlo igual
+_SPACES = re.compile(r"\s+")
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+_THINK = re.compile(r"<think>.*?</think>", re.S)
+_THINK_OPEN = re.compile(r"<think>.*", re.S)
+
+CHARS_PER_TOKEN = 4  # estimación para español, sin cargar el tokenizador del modelo
+PROMPT_TOKENS = 200  # reserva para la instrucción dentro de num_ctx
+WARM_UP_TIMEOUT = 300  # cargar un modelo grande desde disco puede llevar minutos
+
+# Ollama caído o trabado: se prueba /api/tags antes de pedir resúmenes y,
+# tras varias fallas seguidas, se deja de esperar cada timeout por un rato
+HEALTH_TIMEOUT = 2
+BREAKER_FAILURES = 3   # fallas seguidas que abren el circuito
+BREAKER_COOLDOWN = 30  # segundos con el circuito abierto antes de volver a probar
+
+# Resúmenes fallidos: se reintentan en segundo plano con espera exponencial
+RETRY_DELAY = 15       # segundos antes del primer reintento; se duplica en cada falla
+RETRY_MAX_DELAY = 600
+RETRY_ATTEMPTS = 6     # después se abandona (el próximo refresco lo vuelve a pedir)
+RETRY_PENDING = 1000   # textos esperando reintento, como máximo
+
+# Opciones de generación. num_ctx tiene que ser fijo por modelo: si cambia
+# entre pedidos, Ollama vuelve a cargar el modelo
+DEFAULT_OPTIONS = {"temperature": 0.3, "num_ctx": 2048, "num_predict": 96}
+MODEL_OPTIONS = {
+    # Sin razonamiento (ver REASONING_MODELS) el resumen es corto; el margen
+    # es para un Ollama viejo que ignora "think" y razona igual
+    "deepseek-r1": {"num_ctx": 4096, "num_predict": 512},
+    "gemma3:1b": {"num_ctx": 2048, "num_predict": 64},
+}
+# Modelos que razonan (<think>…</think>) antes de responder: se les pide
+# `think: false` y, si igual razonan, el bloque se quita de la respuesta
+REASONING_MODELS = ("deepseek-r1",)
+
+log = logging.getLogger(__name__)
+
+
+class Summary(NamedTuple):
+    text: str                    # vacío si el resumen falló
+    latency: float               # segundos que tardó el pedido
+    ok: bool
+    cached: bool = False
+    error: Optional[str] = None  # motivo de la falla
+
+
+class CircuitBreaker:
+    """Deja de mandar pedidos a un host después de `failures` fallas seguidas.
+
+    Abierto, `allow` devuelve False al instante durante `cooldown` segundos;
+    después deja pasar un solo pedido de prueba y, si responde, se cierra.
+    """
+
+    def __init__(self, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN):
+        self.failures = failures
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._count = 0
+        self._opened = None  # time.monotonic() de la apertura
+        self._trial = False
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened is not None
+
+    @property
+    def cooled(self) -> bool:
+        """Cerrado, o abierto desde hace más de `cooldown` (haya o no un pedido de prueba)."""
+        with self._lock:
+            return self._opened is None or time.monotonic() - self._opened >= self.cooldown
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened is None:
+                return True
+            if self._trial or time.monotonic() - self._opened < self.cooldown:
+                return False
+            self._trial = True
+            return True
+
+    def success(self):
+        with self._lock:
+            self._count, self._opened, self._trial = 0, None, False
+
+    def failure(self):
+        with self._lock:
+            self._count += 1
+            # Si falla el pedido de prueba se vuelve a abrir por otro `cooldown`
+            if self._trial or self._count >= self.failures:
+                self._opened, self._trial = time.monotonic(), False
+
+    def trip(self):
+        with self._lock:
+            self._count, self._opened, self._trial = self.failures, time.monotonic(), False
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+# La prueba de salud no reintenta: tiene que contestar rápido si Ollama no está
+_probe_session = new_session(per_host=2, retry=0)
+
+
+def get_breaker(host: str = OLLAMA) -> CircuitBreaker:
+    """Circuito compartido por todo el proceso para `host`."""
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker()
+        return _breakers[host]
+
+
+def as_hosts(host) -> tuple:
+    """Un host o una lista de hosts, como tupla."""
+    return (host,) if isinstance(host, str) else tuple(host)
+
+
+def check_health(host: str = OLLAMA, timeout: float = HEALTH_TIMEOUT) -> bool:
+    """Prueba rápida de que Ollama responde (`/api/tags`, sin cargar modelos).
+
+    Con el circuito abierto no se prueba hasta que pase el `cooldown`, aunque
+    haya un pedido de prueba en curso: si ese pedido quedó trabado, la prueba
+    igual puede volver a cerrar el circuito. Si la prueba falla el circuito
+    se abre enseguida, sin esperar a que fallen los resúmenes de a uno.
+    """
+    breaker = get_breaker(host)
+    if not breaker.cooled:
+        return False
+    try:
+        with registry.timer("ollama_health"):
+            _probe_session.get(f"{host}/api/tags", timeout=timeout).raise_for_status()
+    except Exception as e:
+        log.warning("Ollama no responde en %s: %s", host, e)
+        registry.incr("ollama_unavailable")
+        breaker.trip()
+        return False
+    breaker.success()
+    return True
+
+
+def record_eval(model: str, response: dict):
+    # Ollama informa los tokens generados y el tiempo de generación (ns) en la
+    # respuesta final; con eso se calcula tokens/s por modelo
+    if "eval_count" in response:
+        registry.incr("ollama_eval_tokens", response["eval_count"], model=model)
+        registry.incr("ollama_eval_seconds", response.get("eval_duration", 0) / 1e9, model=model)
+
+
+def model_options(model: str) -> dict:
+    """Opciones para `model`: las propias (por nombre completo o sin el tag) sobre las por defecto."""
+    options = dict(DEFAULT_OPTIONS)
+    options.update(MODEL_OPTIONS.get(model.split(":")[0], {}))
+    options.update(MODEL_OPTIONS.get(model, {}))
+    return options
+
+
+def truncate(text: str, budget: int = INPUT_TOKENS) -> str:
+    """Recorta `text` a unos `budget` tokens, cortando entre oraciones.
+
+    Si ya la primera oración no entra, se corta en el último espacio.
+    """
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    kept = ""
+    for sentence in _SENTENCE_END.split(text):
+        candidate = f"{kept} {sentence}" if kept else sentence
+        if len(candidate) > limit:
+            break
+        kept = candidate
+    return kept or text[:limit].rsplit(" ", 1)[0] + "…"
+
+
+def input_budget(model: str, n: int = 1) -> int:
+    """Tokens de texto por noticia para que `n` noticias y sus resúmenes entren en num_ctx."""
+    options = model_options(model)
+    free = options["num_ctx"] - PROMPT_TOKENS - options["num_predict"] * n
+    return max(32, min(INPUT_TOKENS, free // n))
+
+
+def prompt_key(prompt: str, budget: int) -> str:
+    """Lo que identifica un resumen en el caché, además del modelo y el texto.
+
+    La plantilla que se usó de verdad (la de lote no es la de a una) y el
+    presupuesto con que se recortó el texto: si cambia `RADAR_INPUT_TOKENS` o
+    `num_ctx`, el modelo vio otro texto y el resumen no se reutiliza.
+    """
+    return f"{prompt}\0{budget}"
+
+
+def summary_keys(model: str, prompt: str = PROMPT, batch_size: int = 1) -> list:
+    """Claves de caché con que se guardan los resúmenes de `model`, en orden de preferencia.
+
+    Con lotes, primero la del lote; las noticias que el lote no devolvió se
+    resumen de a una y quedan con la clave de `prompt`.
+    """
+    keys = [prompt_key(prompt, input_budget(model))]
+    if batch_size > 1:
+        keys.insert(0, prompt_key(BATCH_PROMPT, input_budget(model, batch_size)))
+    return keys
+
+
+def cached_summary(text: str, model: str, prompt: str = PROMPT, batch_size: int = 1, cache=None):
+    """Resumen de `text` ya guardado en el caché (por defecto el compartido), o None."""
+    cache = get_cache() if cache is None else cache
+    for key in summary_keys(model, prompt, batch_size):
+        tldr = cache.get(model, key, text)
+        if tldr is not None:
+            return tldr
+    return None
+
+
+def strip_think(text: str) -> str:
+    """Respuesta sin el razonamiento `<think>…</think>` del modelo.
+
+    Si el razonamiento quedó abierto (la respuesta se cortó por
+    `num_predict` antes de terminarlo), o no queda nada, no hay resumen:
+    se lanza ValueError para que cuente como falla.
+    """
+    text = _THINK.sub("", text)
+    if "<think>" in text:
+        raise ValueError("la respuesta se cortó mientras el modelo razonaba (<think>)")
+    text = text.strip()
+    if not text:
+        raise ValueError("respuesta vacía")
+    return text
+
+
+def visible_text(text: str) -> str:
+    # Texto parcial para mostrar mientras llega: sin el razonamiento, aunque esté abierto
+    return _THINK_OPEN.sub("", _THINK.sub("", text)).strip()
+
+
+def request_body(model: str, prompt: str, stream: bool, num_predict: int = None, **extra) -> dict:
+    options = model_options(model)
+    if num_predict is not None:
+        options["num_predict"] = num_predict
+    body = {"model": model, "prompt": prompt, "stream": stream, "keep_alive": KEEP_ALIVE, "options": options}
+    if model.split(":")[0] in REASONING_MODELS:
+        body["think"] = False
+    return dict(body, **extra)
+
+
+def warm_up(model: str, host: str = OLLAMA, timeout: float = WARM_UP_TIMEOUT) -> bool:
+    """Carga `model` en Ollama sin generar nada, para que el primer resumen no espere la carga.
+
+    Usa las mismas opciones que los resúmenes (un num_ctx distinto obligaría
+    a recargarlo). Un error sólo se registra: el primer pedido lo cargará.
+    """
+    try:
+        with registry.timer("ollama_warmup", model=model):
+            body = {"model": model, "keep_alive": KEEP_ALIVE, "options": model_options(model)}
+            get_session().post(f"{host}/api/generate", json=body, timeout=timeout).raise_for_status()
+        return True
+    except Exception as e:
+        log.warning("No se pudo precargar %s en %s: %s", model, host, e)
+        return False
+
+
+def ollama_tldr(text: str, model: str, host: str = OLLAMA, prompt: str = PROMPT,
+                timeout: float = TIMEOUT) -> str:
+    r = get_session().post(f"{host}/api/generate",
+        json=request_body(model, prompt.format(text=truncate(text, input_budget(model))), stream=False),
+        timeout=timeout)
+    r.raise_for_status()
+    response = r.json()
+    record_eval(model, response)
+    return strip_think(response["response"])
+
+
+def ollama_stream(text: str, model: str, host: str = OLLAMA, prompt: str = PROMPT,
+                  timeout: float = TIMEOUT):
+    """Genera los fragmentos de texto a medida que Ollama los produce (NDJSON)."""
+    with get_session().post(f"{host}/api/generate",
+            json=request_body(model, prompt.format(text=truncate(text, input_budget(model))), stream=True),
+            timeout=timeout, stream=True) as r:
+        r.raise_for_status()
+        for line in r.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if "error" in chunk:
+                raise RuntimeError(chunk["error"])
+            yield chunk.get("response", "")
+            # Sin cortar el bucle: se lee la respuesta hasta el final para que
+            # la conexión vuelva al pool en lugar de cerrarse
+            if chunk.get("done"):
+                record_eval(model, chunk)
+
+
+def batch_items(texts, budget: int = INPUT_TOKENS) -> str:
+    # "[id] texto", una noticia por línea; los ids empiezan en 1
+    return "\n".join(f"[{i}] {truncate(_SPACES.sub(' ', text).strip(), budget)}" for i, text in enumerate(texts, 1))
+
+
+def parse_batch(raw: str, n: int) -> list:
+    """Resúmenes de un lote alineados por id; None en los que faltan o no son válidos."""
+    tldrs = [None] * n
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return tldrs
+    if isinstance(data, dict):
+        # {"resumenes": [...]} o cualquier otra clave con la lista
+        data = next((value for value in data.values() if isinstance(value, list)), None)
+    if not isinstance(data, list):
+        return tldrs
+    if len(data) == n and all(isinstance(item, str) for item in data):
+        # Lista de oraciones sin ids: sólo se acepta si coincide la cantidad
+        return [item.strip() or None for item in data]
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        try:
+            i = int(item.get("id")) - 1
+        except (TypeError, ValueError):
+            continue
+        tldr = item.get("resumen") or item.get("summary")
+        if 0 <= i < n and tldrs[i] is None and isinstance(tldr, str) and tldr.strip():
+            tldrs[i] = tldr.strip()
+    return tldrs
+
+
+def ollama_batch(texts, model: str, host: str = OLLAMA, timeout: float = TIMEOUT, budget: int = None) -> list:
+    """Resume varias noticias en un pedido con salida JSON (`format: json`).
+
+    Devuelve una lista alineada con `texts`, con None donde la respuesta no
+    trae un resumen válido para esa noticia. `budget` son los tokens de texto
+    por noticia (por defecto, los que entran con `len(texts)` noticias).
+    """
+    texts = list(texts)
+    if budget is None:
+        budget = input_budget(model, len(texts))
+    prompt = BATCH_PROMPT.format(items=batch_items(texts, budget))
+    # Una oración por noticia, más lo que ocupa el JSON alrededor
+    num_predict = model_options(model)["num_predict"] * len(texts) + 16
+    r = get_session().post(f"{host}/api/generate",
+        json=request_body(model, prompt, stream=False, num_predict=num_predict, format="json"),
+        timeout=timeout)
+    r.raise_for_status()
+    response = r.json()
+    record_eval(model, response)
+    return parse_batch(_THINK.sub("", response["response"]), len(texts))
+
+
+def _generate(text: str, model: str, host: str, on_token=None, **kwargs) -> Summary:
+    """Resume `text` en `host`; con `on_token` se usa streaming y se le pasa el texto parcial.
+
+    No consulta el circuito (el que llama ya lo hizo). Nunca lanza: si falla,
+    devuelve `ok=False` con el texto vacío y el motivo en `error` (el mensaje
+    no debe terminar mostrado como resumen).
+    """
+    breaker = get_breaker(host)
+    start = time.perf_counter()
+    try:
+        if on_token is None:
+            tldr = ollama_tldr(text, model, host, **kwargs)
+        else:
+            parts = []
+            for token in ollama_stream(text, model, host, **kwargs):
+                parts.append(token)
+                on_token(visible_text("".join(parts)))
+            tldr = strip_think("".join(parts))
+        ok, error = True, None
+        breaker.success()
+    except Exception as e:
+        registry.incr("ollama_errors", model=model, error=type(e).__name__)
+        breaker.failure()
+        tldr, ok, error = "", False, str(e)
+    latency = time.perf_counter() - start
+    registry.observe("ollama_generate", latency, model=model, host=host)
+    return Summary(tldr, latency, ok, error=error)
+
+
+class HostPool:
+    """Reparte los pedidos entre varios servidores de Ollama.
+
+    Cada pedido va al host con menos pedidos en curso, sin pasar de `limit`
+    por host; si todos están llenos, se espera a que uno se libere. Los
+    hosts con el circuito abierto no reciben pedidos, salvo el de prueba
+    cuando vence su `cooldown`. Los contadores son del proceso: todos los
+    motores que usan los mismos hosts comparten el pool (`get_pool`).
+    """
+
+    def __init__(self, hosts):
+        self.hosts = as_hosts(hosts)
+        self._cond = threading.Condition()
+        self._outstanding = dict.fromkeys(self.hosts, 0)
+
+    def acquire(self, limit: int = MAX_IN_FLIGHT) -> Optional[str]:
+        """Host para el próximo pedido (ya contado como en curso), o None si ninguno responde."""
+        with self._cond:
+            while True:
+                closed = [host for host in self.hosts if not get_breaker(host).is_open]
+                free = [host for host in closed if self._outstanding[host] < limit]
+                if not free:
+                    # Un host caído puede recibir su pedido de prueba: `allow`
+                    # lo reserva, así que se pide de a uno y sólo hasta el primero
+                    for host in self.hosts:
+                        if host not in closed and self._outstanding[host] < limit and get_breaker(host).allow():
+                            free = [host]
+                            break
+                if free:
+                    host = min(free, key=self._outstanding.get)
+                    self._outstanding[host] += 1
+                    return host
+                if not closed:
+                    return None
+                # El estado de los circuitos cambia sin aviso: se revisa cada tanto
+                self._cond.wait(1.0)
+
+    def release(self, host: str):
+        with self._cond:
+            self._outstanding[host] -= 1
+            self._cond.notify()
+
+    def outstanding(self) -> dict:
+        with self._cond:
+            return dict(self._outstanding)
+
+    def summarize(self, text: str, model: str, limit: int = MAX_IN_FLIGHT, **kwargs) -> Summary:
+        """Resume `text` en el host más libre; falla al instante si ninguno responde."""
+        host = self.acquire(limit)
+        if host is None:
+            registry.incr("ollama_short_circuit", model=model)
+            return Summary("", 0.0, False, error="Ollama no responde")
+        try:
+            return _generate(text, model, host, **kwargs)
+        finally:
+            self.release(host)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(hosts=OLLAMA_HOSTS) -> HostPool:
+    """Pool compartido por todo el proceso para esos hosts."""
+    hosts = as_hosts(hosts)
+    with _pools_lock:
+        if hosts not in _pools:
+            _pools[hosts] = HostPool(hosts)
+        return _pools[hosts]
+
+
+class RetryQueue:
+    """Reintenta en segundo plano los resúmenes que fallaron.
+
+    Un solo hilo, de a un pedido por vez, para no cargar a un Ollama que se
+    está recuperando. Cada texto espera `delay` segundos, el doble después de
+    cada falla (hasta `max_delay`), y se abandona tras `attempts` intentos.
+    Si el mismo texto se agrega de nuevo mientras espera, se reintenta una
+    sola vez y se avisa a todos los que lo pidieron.
+    """
+
+    def __init__(self, delay: float = RETRY_DELAY, max_delay: float = RETRY_MAX_DELAY,
+                 attempts: int = RETRY_ATTEMPTS, limit: int = RETRY_PENDING):
+        self.delay = delay
+        self.max_delay = max_delay
+        self.attempts = attempts
+        self.limit = limit
+        self._cond = threading.Condition()
+        self._heap = []   # (vencimiento, orden, clave)
+        self._items = {}  # (model, host, prompt, text) -> intentos, avisos, caché y timeout
+        self._order = itertools.count()
+        self._thread = None
+
+    def add(self, text: str, model: str, host=OLLAMA_HOSTS, prompt: str = PROMPT, timeout: float = TIMEOUT,
+            cache=None, on_retry=None) -> bool:
+        """Agenda el reintento de `text` en `host` (uno o varios); False si la cola está llena.
+
+        Si sale bien, el resumen se guarda en `cache` (si hay) y se llama a
+        `on_retry(summary)` desde el hilo de reintentos.
+        """
+        key = (model, as_hosts(host), prompt, text)
+        with self._cond:
+            item = self._items.get(key)
+            if item is None:
+                if len(self._items) >= self.limit:
+                    registry.incr("ollama_retry_dropped", model=model)
+                    return False
+                item = self._items[key] = {"attempts": 0, "callbacks": [], "cache": cache, "timeout": timeout}
+                heapq.heappush(self._heap, (time.monotonic() + self.delay, next(self._order), key))
+                registry.incr("ollama_retry_queued", model=model)
+            if on_retry is not None:
+                item["callbacks"].append(on_retry)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, daemon=True, name="ollama-retry")
+                self._thread.start()
+            self._cond.notify()
+        return True
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+    def _next(self):
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._heap and self._heap[0][0] <= now:
+                    key = heapq.heappop(self._heap)[2]
+                    return key, self._items[key]
+                self._cond.wait(self._heap[0][0] - now if self._heap else None)
+
+    def _loop(self):
+        while True:
+            key, item = self._next()
+            model, hosts, prompt, text = key
+            result = get_pool(hosts).summarize(text, model, prompt=prompt, timeout=item["timeout"])
+            with self._cond:
+                if not result.ok:
+                    item["attempts"] += 1
+                    if item["attempts"] < self.attempts:
+                        delay = min(self.max_delay, self.delay * 2 ** item["attempts"])
+                        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._order), key))
+                    else:
+                        registry.incr("ollama_retry_gave_up", model=model)
+                        del self._items[key]
+                    continue
+                del self._items[key]
+            registry.incr("ollama_retry_ok", model=model)
+            if item["cache"] is not None:
+                item["cache"].put(model, prompt_key(prompt, input_budget(model)), text, result.text)
+            for callback in item["callbacks"]:
+                try:
+                    callback(result)
+                except Exception:
+                    log.exception("Falló el aviso de un resumen reintentado")
+
+
+_retries = None
+_retries_lock = threading.Lock()
+
+
+def get_retries() -> RetryQueue:
+    """Cola de reintentos compartida por todo el proceso."""
+    global _retries
+    with _retries_lock:
+        if _retries is None:
+            _retries = RetryQueue()
+        return _retries
+
+
+class SummaryEngine:
+    """Mantiene hasta `max_in_flight` pedidos en curso en cada servidor de Ollama.
+
+    `host` puede ser uno o varios servidores: cada pedido va al que tiene
+    menos pedidos en curso y que responde (ver `HostPool`), así sumar un
+    servidor suma su capacidad.
+
+    `submit` se bloquea cuando ya hay demasiados pedidos esperando, así el
+    productor (la lectura de feeds) avanza al ritmo del servidor. Los textos
+    que ya están en el caché de resúmenes se resuelven sin llamar a Ollama.
+
+    Antes del primer pedido que no está en el caché se prueba que cada
+    servidor responda (`check_health`); los que no, o los que fallan varias
+    veces seguidas, dejan de recibir pedidos. Si no queda ninguno, los
+    resúmenes fallan al instante (`ok=False`). Los que
+    fallan se agregan a la cola de reintentos (`retries`; None la desactiva).
+
+    Con `batch_size` > 1 las noticias se juntan de a `batch_size` (o lo que
+    haya llegado en `BATCH_WAIT` segundos) y se resumen en un solo pedido con
+    salida JSON; las que el modelo no devuelve bien se piden de a una. En ese
+    modo no hay streaming: `on_token` se ignora.
+    """
+
+    def __init__(self, model: str, max_in_flight: int = MAX_IN_FLIGHT, host=OLLAMA_HOSTS,
+                 prompt: str = PROMPT, timeout: float = TIMEOUT, cache="shared", batch_size: int = BATCH_SIZE,
+                 retries="shared"):
+        self.model = model
+        self.hosts = as_hosts(host)
+        self.hosts_pool = get_pool(self.hosts)
+        self.max_in_flight = max_in_flight
+        self.prompt = prompt
+        self.timeout = timeout
+        self.batch_size = max(1, batch_size)
+        # cache=None desactiva el caché persistente (p. ej. para medir tiempos)
+        self.cache = get_cache() if cache == "shared" else cache
+        self.retries = get_retries() if retries == "shared" else retries
+        # El lote siempre recorta para `batch_size` noticias, aunque se mande
+        # con menos: así su clave de caché no depende de cuántas llegaron
+        self.batch_budget = input_budget(model, self.batch_size)
+        self.keys = summary_keys(model, prompt, self.batch_size)
+        workers = max_in_flight * len(self.hosts)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ollama")
+        self._slots = threading.BoundedSemaphore(workers * 2 * self.batch_size)
+        self._probed = False
+        self._batches = None
+        if self.batch_size > 1:
+            self._batches = queue.Queue()
+            self._collector = threading.Thread(target=self._collect, daemon=True, name="ollama-batch")
+            self._collector.start()
+
+    def _finish(self, text: str, result: Summary, on_done, on_retry, key: str) -> Summary:
+        # Sólo se guardan los resúmenes reales; los fallidos van a reintentarse
+        if result.ok and self.cache is not None:
+            self.cache.put(self.model, key, text, result.text)
+        if on_done is not None:
+            on_done(result)
+        if not result.ok and self.retries is not None:
+            self.retries.add(text, self.model, self.hosts, self.prompt, self.timeout, self.cache, on_retry)
+        return result
+
+    def _run(self, text: str, on_token, on_done, on_retry) -> Summary:
+        result = self.hosts_pool.summarize(text, self.model, self.max_in_flight, on_token=on_token,
+                                           prompt=self.prompt, timeout=self.timeout)
+        return self._finish(text, result, on_done, on_retry, self.keys[-1])
+
+    def _collect(self):
+        # Arma los lotes con lo que va llegando a `submit`; None indica el cierre
+        closing = False
+        while not closing:
+            item = self._batches.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + BATCH_WAIT
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._batches.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+            self._pool.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch):
+        texts = [text for text, _, _, _ in batch]
+        start = time.perf_counter()
+        tldrs = [None] * len(texts)
+        # Sin ningún host que responda el lote no se manda y cada noticia
+        # falla al instante en `_run`
+        host = self.hosts_pool.acquire(self.max_in_flight)
+        if host is not None:
+            breaker = get_breaker(host)
+            try:
+                # El modelo escribe una oración por noticia: el límite crece con el lote
+                tldrs = ollama_batch(texts, self.model, host=host, timeout=self.timeout * len(texts),
+                                     budget=self.batch_budget)
+                breaker.success()
+            except Exception as e:
+                registry.incr("ollama_errors", model=self.model, error=type(e).__name__)
+                breaker.failure()
+            finally:
+                self.hosts_pool.release(host)
+        elapsed = time.perf_counter() - start
+        registry.observe("ollama_batch", elapsed, model=self.model)
+        for (text, on_done, on_retry, future), tldr in zip(batch, tldrs):
+            try:
+                if tldr is None:
+                    registry.incr("ollama_batch_fallbacks", model=self.model)
+                    future.set_result(self._run(text, None, on_done, on_retry))
+                else:
+                    # Latencia de la noticia: su parte del tiempo del lote
+                    future.set_result(self._finish(text, Summary(tldr, elapsed / len(texts), True), on_done, on_retry,
+                                                   self.keys[0]))
+            except Exception as e:
+                future.set_exception(e)
+
+    def submit(self, text: str, on_token=None, on_done=None, on_retry=None) -> Future:
+        """Agenda el resumen de `text`.
+
+        `on_token(parcial)` activa el streaming; `on_done(summary)` corre en el
+        hilo del pedido antes de que el Future quede resuelto. Si el resumen
+        falla, `on_retry(summary)` se llama más tarde, desde el hilo de
+        reintentos, cuando uno de los reintentos sale bien.
+        """
+        if self.cache is not None:
+            tldr = self.lookup(text)
+            registry.incr("summary_cache_hits" if tldr is not None else "summary_cache_misses", model=self.model)
+            if tldr is not None:
+                result = Summary(tldr, 0.0, True, cached=True)
+                if on_done is not None:
+                    on_done(result)
+                future = Future()
+                future.set_result(result)
+                return future
+        if not self._probed:
+            self._probed = True
+            list(self._pool.map(check_health, self.hosts))
+        self._slots.acquire()
+        if self._batches is not None:
+            future = Future()
+            self._batches.put((text, on_done, on_retry, future))
+        else:
+            future = self._pool.submit(self._run, text, on_token, on_done, on_retry)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def lookup(self, text: str):
+        """Resumen de `text` ya guardado en el caché, sin llamar a Ollama (o None)."""
+        if self.cache is None:
+            return None
+        return cached_summary(text, self.model, self.prompt, self.batch_size, self.cache)
+
+    def map(self, texts) -> list:
+        # Resultados en el mismo orden que los textos de entrada
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def close(self):
+        if self._batches is not None:
+            self._batches.put(None)
+            self._collector.join()
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,209 @@
+"""Pipeline de ingesta: feeds RSS -> resumen con Ollama -> sentimiento."""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from radar import archive
+from radar.config import ARGENTINA_TZ, BATCH_SIZE, MAX_IN_FLIGHT, OLLAMA_HOSTS, RSS_MAP
+from radar.dedup import Deduper
+from radar.entries import entry_published, get_store, split_new
+from radar.feeds import iter_feeds
+from radar.metrics import registry
+from radar.ollama import SummaryEngine
+from radar.search import get_index
+from radar.sentiment import analyze_batch
+
+COLUMNS = ["key", "source", "date", "published_text", "title", "link", "tldr", "sentiment", "latency"]
+
+
+def to_frame(rows, feeds) -> pd.DataFrame:
+    """DataFrame de las entradas, en el orden de las fuentes elegidas.
+
+    El sentimiento se calcula de una vez para todas las filas con el resumen
+    completo; las que todavía se están resumiendo, o cuyo resumen falló,
+    quedan sin sentimiento.
+    """
+    order = {tag: i for i, tag in enumerate(feeds)}
+    rows = sorted(rows, key=lambda entry: order[entry["source"]])
+    df = pd.DataFrame([{
+        "key": entry["key"],
+        "source": entry["source"],
+        "date": entry["published"],
+        "published_text": entry["published_text"],
+        "title": entry["title"],
+        "link": entry["link"],
+        "tldr": entry.get("tldr"),
+        "sentiment": None,
+        "latency": entry.get("latency"),
+    } for entry in rows], columns=COLUMNS)
+    with registry.timer("dates"):
+        # Epoch -> datetime64 con zona horaria, en una sola pasada (None -> NaT)
+        df["date"] = pd.to_datetime(df["date"].astype("float64"), unit="s", utc=True).dt.tz_convert(ARGENTINA_TZ)
+    done = np.array([entry.get("done", False) and not entry.get("retry", False) for entry in rows], dtype=bool)
+    if done.any():
+        with registry.timer("sentiment"):
+            df.loc[done, "sentiment"] = analyze_batch(df.loc[done, "tldr"])
+    return df
+
+
+def fetch_papers(feeds, total_max_n, model, rss_map=RSS_MAP, host=OLLAMA_HOSTS,
+                 max_in_flight=MAX_IN_FLIGHT, since=None, on_progress=None,
+                 batch_size=BATCH_SIZE, on_retry=None) -> pd.DataFrame:
+    """Noticias de las fuentes `feeds`, resumidas con `model`.
+
+    `date` es una columna datetime64 en hora de Argentina (NaT si el feed no
+    trae la fecha parseada; en ese caso queda el texto original en
+    `published_text`). Se formatea recién al mostrarla o exportarla.
+
+    Con `since` (epoch) sólo se procesan las entradas publicadas desde ese
+    momento: el filtro se aplica sobre `published_parsed` antes de resumir.
+    Las entradas sin fecha parseada se conservan: no se puede saber si caen
+    fuera del rango, y el archivo histórico las guarda en el día de ingesta.
+
+    Si se pasa `on_progress(rows)`, los resúmenes se piden en streaming y se
+    llama con la lista de entradas (dicts) cada vez que una cambia: al
+    llegar, con cada fragmento del resumen y al completarse.
+
+    `host` puede ser una lista de servidores de Ollama: los resúmenes se
+    reparten entre ellos, con hasta `max_in_flight` pedidos en cada uno.
+
+    `batch_size` > 1 resume varias noticias por pedido a Ollama (sin
+    streaming); ver `SummaryEngine`.
+
+    Si Ollama no responde, las entradas quedan sólo con el título (`tldr`
+    vacío, sin sentimiento) y no se registran. Se reintentan en segundo plano
+    (ver `RetryQueue`): cuando uno sale bien se registra y se llama a
+    `on_retry(entries)` con la entrada y sus copias ya completas, aunque la
+    corrida haya terminado. Si no, el próximo refresco las vuelve a pedir.
+
+    Los tiempos y contadores de cada etapa quedan en `radar.metrics.registry`
+    y se vuelcan a `data/metrics.json` al terminar.
+    """
+    with registry.timer("pipeline", model=model):
+        df = _fetch_papers(feeds, total_max_n, model, rss_map, host, max_in_flight, since, on_progress, batch_size,
+                           on_retry)
+    registry.write()
+    return df
+
+
+def _fetch_papers(feeds, total_max_n, model, rss_map, host, max_in_flight, since, on_progress,
+                  batch_size, on_retry) -> pd.DataFrame:
+    rows = []
+    pending = []
+    per_source = max(5, total_max_n // len(feeds))
+    store = get_store()
+    notify = on_progress or (lambda rows: None)
+    # Las notas repetidas entre fuentes se resumen una sola vez: la primera de
+    # cada grupo va a Ollama y su resumen se copia a las demás
+    deduper = Deduper()
+    lock = threading.Lock()
+
+    def copy_summary(source, entry):
+        entry["tldr"] = source["tldr"]
+        entry["latency"] = 0.0
+        entry["retry"] = source.get("retry", False)
+        entry["copy_of"] = source
+        entry["done"] = True
+
+    def finish(entry, result):
+        # Un resumen fallido no se muestra ni se guarda: la fila queda con el
+        # título y marcada para reintentar
+        entry["tldr"] = result.text if result.ok else None
+        entry["retry"] = not result.ok
+        entry["latency"] = round(result.latency, 2)  # segundos que tardó Ollama en este resumen
+        with lock:
+            entry["done"] = True
+            copies = entry.pop("copies", [])
+        for copy in copies:
+            copy_summary(entry, copy)
+        notify(rows)
+
+    def retried(entry, result):
+        # Llega desde el hilo de reintentos, quizás con la corrida ya terminada
+        fixed = [entry] + [row for row in list(rows) if row.get("copy_of") is entry]
+        sentiment = str(analyze_batch([result.text])[0])
+        for row in fixed:
+            row.update(tldr=result.text, latency=round(result.latency, 2), sentiment=sentiment, retry=False)
+        registry.incr("entries_retried", model=model)
+        store.add(model, fixed)
+        archive.append(model, fixed)
+        get_index().add(model, fixed)
+        if on_retry is not None:
+            on_retry(fixed)
+
+    def partial(entry, text):
+        entry["tldr"] = text
+        notify(rows)
+
+    with SummaryEngine(model, max_in_flight, host=host, batch_size=batch_size) as engine:
+        # Los feeds se descargan en paralelo y se procesan a medida que llegan
+        for tag, parsed in iter_feeds(feeds, rss_map):
+            entries = parsed.entries
+            if since is not None:
+                entries = [e for e in entries if entry_published(e) is None or entry_published(e) >= since]
+            # Las entradas ya procesadas se reutilizan; sólo las nuevas van a Ollama
+            for key, e, entry in split_new(store, model, tag, entries[:per_source]):
+                ids = (e.get("link"), e.get("id"))
+                if entry is not None:
+                    registry.incr("entries_stored", source=tag, model=model)
+                    entry["done"] = True
+                    deduper.add(ids, f"{entry['title']} {entry['summary'] or ''}", entry)
+                    rows.append(entry)
+                    notify(rows)
+                    continue
+
+                summary = e.summary.replace("\n", " ") if 'summary' in e else ""
+                entry = {
+                    "key": key,
+                    "source": tag,
+                    "published": entry_published(e),
+                    "published_text": e.get("published", ""),
+                    "title": e.title,
+                    "link": e.link,
+                    "summary": summary,
+                }
+                rows.append(entry)
+                registry.incr("entries_new", source=tag, model=model)
+                text = f"{entry['title']} {summary}"
+                original = deduper.find(ids, text)
+                if original is not None:
+                    registry.incr("entries_duplicate", source=tag, model=model)
+                    with lock:
+                        done = original.get("done", False)
+                        if not done:
+                            original.setdefault("copies", []).append(entry)
+                    if done:
+                        copy_summary(original, entry)
+                    pending.append((entry, original.get("future")))
+                else:
+                    deduper.add(ids, text, entry)
+                    # El resumen se pide a Ollama en segundo plano y se completa en `finish`
+                    entry["future"] = engine.submit(
+                        summary,
+                        on_token=(lambda text, entry=entry: partial(entry, text)) if on_progress else None,
+                        on_done=lambda result, entry=entry: finish(entry, result),
+                        on_retry=lambda result, entry=entry: retried(entry, result))
+                    pending.append((entry, entry["future"]))
+                notify(rows)
+
+        # Sólo se registran las entradas con un resumen real (o copiado de uno real)
+        new_entries = [entry for entry, future in pending if future is None or future.result().ok]
+        with registry.timer("sentiment"):
+            sentiments = analyze_batch([entry["tldr"] for entry in new_entries])
+        for entry, sentiment in zip(new_entries, sentiments):
+            entry["sentiment"] = str(sentiment)
+        archive.backfill(store)
+        with registry.timer("store_write"):
+            store.add(model, new_entries)
+        # Y se agregan al archivo histórico, para consultar rangos de fechas
+        with registry.timer("archive_write"):
+            archive.append(model, new_entries)
+            archive.compact()
+        # Todas las entradas nuevas se indexan para la búsqueda; las que no se
+        # pudieron resumir, sólo por título y resumen original
+        with registry.timer("index_write"):
+            get_index().add(model, [dict(entry, tldr=entry.get("tldr") if future is None or future.result().ok else "")
+                                    for entry, future in pending])
+
+    return to_frame(rows, feeds)
@@ -0,0 +1,133 @@
+"""Refresco del pipeline en segundo plano.
+
+Un hilo por modelo corre `fetch_papers` periódicamente para cada combinación
+(fuentes, cantidad, desde) que pidió la interfaz y publica una foto lista para
+mostrar. La interfaz sólo lee la última foto, así que el tiempo de carga de la
+página no depende de lo que tarden los feeds u Ollama.
+"""
+import logging
+import threading
+import time
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+from radar.config import REFRESH_INTERVAL
+from radar.pipeline import COLUMNS, fetch_papers, to_frame
+
+log = logging.getLogger(__name__)
+
+POLL = 5.0                # segundos entre revisiones de trabajos pendientes
+JOB_TTL = 2 * 3600        # se deja de refrescar lo que nadie pidió en este lapso
+ERROR_RETRY = 60.0        # segundos hasta reintentar una corrida que falló
+
+
+class Snapshot(NamedTuple):
+    df: pd.DataFrame
+    updated: float                 # epoch del final de la corrida
+    error: Optional[str] = None    # error de la última corrida, si falló
+
+
+class Refresher:
+    def __init__(self, model: str, interval: float = REFRESH_INTERVAL, fetch=fetch_papers):
+        self.model = model
+        self.interval = interval
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._snapshots = {}   # (feeds, max_n, since) -> Snapshot
+        self._requested = {}   # (feeds, max_n, since) -> último pedido de la interfaz
+        self._forced = set()
+        self._live = {}        # (feeds, max_n, since) -> entradas de la corrida en curso
+        self._thread = threading.Thread(target=self._loop, daemon=True, name=f"refresher-{model}")
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def snapshot(self, feeds, max_n, since=None) -> Optional[Snapshot]:
+        """Última foto para (feeds, max_n, since); la primera vez agenda la corrida.
+
+        `since` (epoch) limita la ingesta a lo publicado desde ese momento.
+        """
+        key = (tuple(feeds), max_n, since)
+        with self._lock:
+            if key not in self._requested:
+                self._wake.set()
+            self._requested[key] = time.time()
+            return self._snapshots.get(key)
+
+    def live(self, feeds, max_n, since=None) -> Optional[pd.DataFrame]:
+        """Filas de la corrida en curso (con resúmenes parciales), o None."""
+        key = (tuple(feeds), max_n, since)
+        with self._lock:
+            rows = self._live.get(key)
+        if rows is None:
+            return None
+        return to_frame(list(rows), key[0])
+
+    def refresh(self):
+        """Fuerza una nueva corrida de todo lo agendado (botón "Actualizar")."""
+        with self._lock:
+            self._forced.update(self._requested)
+        self._wake.set()
+
+    def _due(self) -> list:
+        now = time.time()
+        with self._lock:
+            for key, requested in list(self._requested.items()):
+                if now - requested > JOB_TTL:
+                    del self._requested[key]
+                    self._snapshots.pop(key, None)
+            due = [key for key in self._requested
+                   if key in self._forced or key not in self._snapshots
+                   or now - self._snapshots[key].updated >= self.interval]
+            self._forced.difference_update(due)
+        return due
+
+    def _run(self, key):
+        feeds, max_n, since = key
+
+        def on_progress(rows):
+            # Sólo se guarda la referencia; el DataFrame se arma al leerlo
+            self._live[key] = rows
+
+        try:
+            df = self._fetch(feeds, max_n, self.model, since=since, on_progress=on_progress,
+                             on_retry=lambda entries: self._patch(key, entries))
+            snap = Snapshot(df, time.time())
+        except Exception as e:
+            log.exception("Falló el refresco de %s para %s", self.model, feeds)
+            with self._lock:
+                previous = self._snapshots.get(key)
+            # Se conserva la última foto buena y se reintenta antes del intervalo normal
+            updated = time.time() - self.interval + ERROR_RETRY
+            snap = Snapshot(previous.df if previous else pd.DataFrame(columns=COLUMNS), updated, str(e))
+        with self._lock:
+            self._snapshots[key] = snap
+            self._live.pop(key, None)
+
+    def _patch(self, key, entries):
+        """Completa en la foto de `key` los resúmenes que salieron en un reintento."""
+        with self._lock:
+            snap = self._snapshots.get(key)
+            if snap is None:
+                # La corrida sigue: sus filas ya tienen el resumen
+                return
+            df = snap.df.copy()
+            for entry in entries:
+                match = (df["source"] == entry["source"]) & (df["key"] == entry["key"])
+                df.loc[match, ["tldr", "sentiment", "latency"]] = [entry["tldr"], entry["sentiment"], entry["latency"]]
+            self._snapshots[key] = snap._replace(df=df)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            for key in self._due():
+                self._run(key)
+            self._wake.wait(POLL)
+            self._wake.clear()
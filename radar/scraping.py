@@ -0,0 +1,178 @@
+"""Portadas y notas de los sitios de la app de scraping.
+
+Cada sitio se describe con datos (ver `URLS` en app_scraping.py): la URL de
+la portada, el selector de los enlaces a las notas y, opcionalmente, el de
+los párrafos del cuerpo. `compile_sites` compila los selectores CSS (con
+cssselect) una sola vez; las páginas se parsean con lxml.
+
+Las notas de todos los sitios se descargan en un mismo pool (`get_fetcher`),
+con un tope de pedidos simultáneos por sitio. Si una nota no tiene texto suficiente se devuelve vacía: no tiene
+sentido pedirle un resumen a Ollama.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+from urllib.parse import urljoin, urlsplit
+
+import lxml.html
+from cssselect import SelectorError
+from lxml import etree
+from lxml.cssselect import CSSSelector
+
+from radar.http import get_session
+from radar.metrics import registry
+
+SECTION_TIMEOUT = 10  # una portada que no responde no frena a las demás
+ARTICLE_TIMEOUT = 15
+ARTICLE_WORKERS = 16  # notas descargándose a la vez, entre todos los sitios
+PER_HOST = 4          # notas del mismo sitio a la vez
+MIN_CHARS = 200       # con menos texto no se considera que haya una nota
+MIN_PARAGRAPH = 40    # párrafos más cortos suelen ser epígrafes, firmas o botones
+MAX_CHARS = 20_000    # el resto no llega al modelo (ver ollama.truncate)
+
+# Párrafos dentro de <article>; si la página no lo usa, todos los <p>
+ARTICLE_PARAGRAPHS = etree.XPath("//article//p")
+ALL_PARAGRAPHS = etree.XPath("//p")
+NOISE = etree.XPath("//script | //style | //noscript | //aside | //nav | //footer | //figcaption")
+
+
+def compile_selector(selector: str) -> etree.XPath:
+    """Selector CSS compilado (p. ej. `.article-title a` o `div > a[href]`).
+
+    Un selector que empieza con "/" se toma como XPath.
+    """
+    if selector.startswith("/"):
+        return etree.XPath(selector)
+    return CSSSelector(selector)
+
+
+class Site(NamedTuple):
+    name: str
+    url: str
+    links: etree.XPath                # enlaces a las notas en la portada
+    body: Optional[etree.XPath] = None  # párrafos de la nota (None: extracción genérica)
+
+
+def compile_sites(urls: dict) -> tuple:
+    """Compila el registro de sitios; devuelve ({nombre: Site}, {nombre: error}).
+
+    Un sitio mal configurado queda afuera con su error, sin afectar al resto.
+    """
+    sites, errors = {}, {}
+    for name, spec in urls.items():
+        try:
+            body = spec.get("body")
+            sites[name] = Site(name, spec["url"], compile_selector(spec["links"]),
+                               compile_selector(body) if body else None)
+        except (KeyError, SelectorError, etree.XPathSyntaxError) as e:
+            errors[name] = f"configuración inválida: {e}"
+    return sites, errors
+
+
+def parse_section(site: Site, html, max_n: int) -> list:
+    """Notas enlazadas en la portada: [{"title", "link"}] con links absolutos y sin repetir."""
+    doc = lxml.html.fromstring(html)
+    news, seen = [], set()
+    for anchor in site.links(doc):
+        href = (anchor.get("href") or "").strip()
+        title = " ".join(anchor.text_content().split())
+        link = urljoin(site.url, href)
+        if not href or not title or urlsplit(link).scheme not in ("http", "https") or link in seen:
+            continue
+        seen.add(link)
+        news.append({"title": title, "link": link})
+        if len(news) >= max_n:
+            break
+    return news
+
+
+def fetch_section(site: Site, max_n: int, timeout: float = SECTION_TIMEOUT) -> list:
+    """Descarga y parsea la portada de `site`; sin notas encontradas es un error."""
+    try:
+        with registry.timer("section_download", site=site.name):
+            r = get_session().get(site.url, timeout=timeout)
+            r.raise_for_status()
+        with registry.timer("section_parse", site=site.name):
+            news = parse_section(site, r.content, max_n)
+        if not news:
+            raise ValueError("el selector no encontró notas")
+    except Exception:
+        registry.incr("section_errors", site=site.name)
+        raise
+    return news
+
+
+def extract_body(html, paragraphs=None) -> str:
+    """Texto del cuerpo de una nota, o "" si no alcanza `MIN_CHARS`.
+
+    `paragraphs` es un XPath compilado propio del sitio; por defecto se usan
+    los párrafos de <article> (o de toda la página).
+    """
+    if not html:
+        return ""
+    try:
+        doc = lxml.html.fromstring(html)
+    except etree.ParserError:
+        # Sólo espacios o comentarios: "Document is empty"
+        return ""
+    for node in NOISE(doc):
+        node.drop_tree()
+    nodes = paragraphs(doc) if paragraphs is not None else (ARTICLE_PARAGRAPHS(doc) or ALL_PARAGRAPHS(doc))
+    texts = [" ".join(node.text_content().split()) for node in nodes]
+    text = " ".join(t for t in texts if len(t) >= MIN_PARAGRAPH)[:MAX_CHARS]
+    return text if len(text) >= MIN_CHARS else ""
+
+
+class ArticleFetcher:
+    """Descarga notas en paralelo respetando `per_host` pedidos por sitio.
+
+    El pool es del objeto, no de cada `fetch_all`: varios sitios pedidos a la
+    vez comparten los `max_workers` hilos y cada uno avanza hasta su tope.
+    """
+
+    def __init__(self, max_workers: int = ARTICLE_WORKERS, per_host: int = PER_HOST,
+                 timeout: float = ARTICLE_TIMEOUT):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self._hosts = {}
+        self._hosts_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="articles")
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._hosts_lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return self._hosts[host]
+
+    def fetch(self, url: str, paragraphs=None) -> str:
+        host = urlsplit(url).netloc
+        try:
+            with self._slot(host), registry.timer("article_download", host=host):
+                r = get_session().get(url, timeout=self.timeout)
+                r.raise_for_status()
+        except Exception:
+            registry.incr("article_errors", host=host)
+            return ""
+        with registry.timer("article_extract", host=host):
+            text = extract_body(r.content, paragraphs)
+        if not text:
+            registry.incr("articles_empty", host=host)
+        return text
+
+    def fetch_all(self, items) -> list:
+        """Cuerpos de las notas `(url, paragraphs)`, en el mismo orden."""
+        return list(self._pool.map(lambda item: self.fetch(*item), list(items)))
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_fetcher() -> ArticleFetcher:
+    """Descargador de notas compartido por todo el proceso."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ArticleFetcher()
+        return _shared
@@ -0,0 +1,108 @@
+"""Búsqueda de texto completo sobre las noticias (SQLite FTS5).
+
+El índice vive en la misma base que el registro de entradas y se actualiza a
+medida que se ingieren noticias. Las columnas UNINDEXED de FTS5 no tienen
+índice, así que `news_fts_keys` guarda el rowid de cada (model, source, key)
+para reemplazar una fila sin recorrer toda la tabla. El tokenizador ignora acentos y mayúsculas
+("inflacion" encuentra "inflación") y cada palabra buscada es un prefijo.
+"""
+import re
+import threading
+
+from radar.db import connect
+
+_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+    model UNINDEXED, source UNINDEXED, key UNINDEXED,
+    title, summary, tldr,
+    tokenize = "unicode61 remove_diacritics 2"
+);
+CREATE TABLE IF NOT EXISTS news_fts_keys (
+    model TEXT NOT NULL,
+    source TEXT NOT NULL,
+    key TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    PRIMARY KEY (model, source, key)
+) WITHOUT ROWID;
+"""
+
+_WORD = re.compile(r"\w+")
+
+
+def to_match(query: str) -> str:
+    """Consulta FTS5: todas las palabras, cada una como prefijo."""
+    return " ".join(f'"{word}"*' for word in _WORD.findall(query))
+
+
+class SearchIndex:
+    def __init__(self, path: str = None):
+        self._lock = threading.Lock()
+        self._conn = connect(path)
+        with self._lock:
+            existed = {name for name, in self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE name IN ('news_fts', 'news_fts_keys')")}
+            self._conn.executescript(_SCHEMA)
+            if "news_fts" not in existed:
+                self._backfill()
+            if "news_fts_keys" not in existed:
+                # Índices creados antes de la tabla de claves (o recién llenados)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO news_fts_keys (model, source, key, id)"
+                    " SELECT model, source, key, rowid FROM news_fts")
+
+    def _backfill(self):
+        # Primera vez: se indexa lo que ya estaba en el registro de entradas
+        has_entries = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'entries'").fetchone()
+        if has_entries:
+            self._conn.execute(
+                "INSERT INTO news_fts (model, source, key, title, summary, tldr)"
+                " SELECT model, source, key, title, summary, tldr FROM entries")
+
+    def add(self, model: str, rows):
+        rows = list(rows)
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for row in rows:
+                    ids = (model, row["source"], row["key"])
+                    found = self._conn.execute(
+                        "SELECT id FROM news_fts_keys WHERE model = ? AND source = ? AND key = ?", ids).fetchone()
+                    if found is not None:
+                        self._conn.execute("DELETE FROM news_fts WHERE rowid = ?", found)
+                    cur = self._conn.execute(
+                        "INSERT INTO news_fts (model, source, key, title, summary, tldr) VALUES (?, ?, ?, ?, ?, ?)",
+                        (*ids, row.get("title") or "", row.get("summary") or "", row.get("tldr") or ""))
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO news_fts_keys (model, source, key, id) VALUES (?, ?, ?, ?)",
+                        (*ids, cur.lastrowid))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def search(self, model: str, query: str) -> dict:
+        """{(source, key): posición} de las coincidencias, de más a menos relevante."""
+        match = to_match(query)
+        if not match:
+            return {}
+        with self._lock:
+            cur = self._conn.execute(
+                "SELECT source, key FROM news_fts WHERE news_fts MATCH ? AND model = ?"
+                " ORDER BY bm25(news_fts, 0, 0, 0, 10.0, 1.0, 5.0)",
+                (match, model))
+            return {(source, key): rank for rank, (source, key) in enumerate(cur)}
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_index() -> SearchIndex:
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SearchIndex()
+        return _shared
@@ -0,0 +1,103 @@
+"""Análisis de sentimiento de los resúmenes.
+
+Se usa un léxico económico en español (el analizador por defecto de TextBlob
+es un léxico en inglés y da resultados casi al azar sobre nuestros resúmenes).
+El puntaje se calcula para toda una columna a la vez: los textos se
+tokenizan con pandas y las palabras se buscan en el léxico con NumPy, sin
+loops de Python por fila. La polaridad de un texto es el promedio de las
+palabras del léxico que contiene; una negación ("no", "sin", ...) invierte las
+palabras que la siguen dentro de una ventana corta.
+"""
+import numpy as np
+import pandas as pd
+
+POSITIVE_THRESHOLD = 0.1
+NEGATIVE_THRESHOLD = -0.1
+
+# Palabras en minúscula y sin acentos -> polaridad en [-1, 1]
+LEXICON = {
+    # positivas
+    "crece": 0.6, "crecen": 0.6, "crecio": 0.6, "crecer": 0.6, "crecimiento": 0.6,
+    "mejora": 0.6, "mejoran": 0.6, "mejoro": 0.6, "mejorar": 0.6, "mejoras": 0.6,
+    "recupera": 0.6, "recuperan": 0.6, "recupero": 0.6, "recuperacion": 0.6,
+    "repunta": 0.5, "repunto": 0.5, "repunte": 0.5, "reactivacion": 0.6,
+    "superavit": 0.7, "excedente": 0.4, "auge": 0.6, "expansion": 0.4,
+    "ganancia": 0.5, "ganancias": 0.5, "gana": 0.5, "ganan": 0.5, "gano": 0.5,
+    "beneficio": 0.5, "beneficios": 0.5, "beneficia": 0.5,
+    "record": 0.3, "acuerdo": 0.4, "acuerdos": 0.4, "alivio": 0.5,
+    "estabilidad": 0.4, "estable": 0.4, "estabiliza": 0.4,
+    "optimismo": 0.7, "optimista": 0.7, "confianza": 0.4,
+    "exito": 0.7, "exitoso": 0.7, "exitosa": 0.7, "favorable": 0.6,
+    "positivo": 0.6, "positiva": 0.6, "positivos": 0.6, "positivas": 0.6,
+    "fortalece": 0.5, "fortalecimiento": 0.5, "solido": 0.5, "solida": 0.5,
+    "impulsa": 0.4, "impulso": 0.4, "avanza": 0.3, "avance": 0.3, "avances": 0.3,
+    "inversion": 0.2, "inversiones": 0.2,
+    # negativas
+    "crisis": -0.8, "recesion": -0.8, "default": -0.8, "quiebra": -0.8, "quiebras": -0.8,
+    "cae": -0.5, "caen": -0.5, "cayo": -0.5, "caida": -0.5, "caidas": -0.5,
+    "desplome": -0.8, "desploma": -0.8, "desplomo": -0.8, "derrumbe": -0.8, "derrumba": -0.8,
+    "inflacion": -0.3, "deficit": -0.6, "deuda": -0.3, "endeudamiento": -0.3,
+    "devaluacion": -0.6, "devalua": -0.6, "desempleo": -0.7, "desocupacion": -0.7,
+    "pobreza": -0.7, "escasez": -0.6, "deterioro": -0.6, "contraccion": -0.6,
+    "perdida": -0.5, "perdidas": -0.5, "pierde": -0.5, "pierden": -0.5, "perdio": -0.5,
+    "retroceso": -0.4, "retrocede": -0.4, "retrocedio": -0.4,
+    "desaceleracion": -0.4, "estancamiento": -0.5, "estancada": -0.5,
+    "incertidumbre": -0.5, "volatilidad": -0.3, "riesgo": -0.2,
+    "tension": -0.4, "tensiones": -0.4, "conflicto": -0.5, "conflictos": -0.5,
+    "paro": -0.5, "huelga": -0.5, "ajuste": -0.2, "fuga": -0.5,
+    "preocupacion": -0.5, "preocupa": -0.5, "temor": -0.5, "temores": -0.5,
+    "alarma": -0.4, "alerta": -0.4, "pesimismo": -0.7, "pesimista": -0.7,
+    "negativo": -0.6, "negativa": -0.6, "negativos": -0.6, "negativas": -0.6,
+}
+NEGATORS = ["no", "sin", "nunca", "tampoco", "ni"]
+NEGATION_WINDOW = 3  # palabras afectadas después de una negación
+
+# Léxico "compilado" una sola vez: índice de palabras + vector de puntajes
+_VOCAB = pd.Index(list(LEXICON))
+_SCORES = np.array(list(LEXICON.values()), dtype=float)
+_NEGATORS = np.array(NEGATORS, dtype=object)
+
+
+def polarity_batch(texts) -> np.ndarray:
+    """Polaridad promedio de cada texto (0 si no tiene palabras del léxico)."""
+    texts = pd.Series(list(texts), dtype=object).fillna("").astype(str)
+    n = len(texts)
+    if n == 0:
+        return np.zeros(0)
+    folded = (texts.str.lower().str.normalize("NFKD")
+              .str.encode("ascii", "ignore").str.decode("ascii"))
+    tokens = folded.str.findall(r"[a-z]+").explode().dropna()
+    if tokens.empty:
+        return np.zeros(n)
+
+    docs = tokens.index.to_numpy(dtype=np.int64)
+    words = tokens.to_numpy(dtype=object)
+    ids = _VOCAB.get_indexer(words)
+    hit = ids >= 0
+    scores = np.where(hit, _SCORES[ids], 0.0)
+
+    # Una negación invierte las palabras siguientes del mismo texto
+    negated = np.isin(words, _NEGATORS)
+    flip = np.zeros(len(words), dtype=bool)
+    for k in range(1, NEGATION_WINDOW + 1):
+        flip[k:] |= negated[:-k] & (docs[k:] == docs[:-k])
+    scores = np.where(flip, -scores, scores)
+
+    total = np.bincount(docs, weights=scores, minlength=n)
+    count = np.bincount(docs, weights=hit, minlength=n)
+    return np.divide(total, count, out=np.zeros(n), where=count > 0)
+
+
+def classify(polarity) -> np.ndarray:
+    polarity = np.asarray(polarity, dtype=float)
+    return np.select([polarity > POSITIVE_THRESHOLD, polarity < NEGATIVE_THRESHOLD],
+                     ["Positiva", "Negativa"], "Neutra")
+
+
+def analyze_batch(texts) -> np.ndarray:
+    """Sentimiento (Positiva / Neutra / Negativa) de toda una columna."""
+    return classify(polarity_batch(texts))
+
+
+def analyze_sentiment(text: str) -> str:
+    return str(analyze_batch([text])[0])
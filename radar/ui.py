@@ -0,0 +1,254 @@
+"""Interfaz Streamlit compartida por las apps.
+
+Nada se ejecuta al importar el módulo: cada app llama a `render_app` (o a
+las partes que necesite) con su modelo.
+"""
+import threading
+from datetime import datetime
+
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+from radar.config import ARGENTINA_TZ, OLLAMA_HOSTS, RSS_MAP
+from radar.export import lazy_export
+from radar.metrics import METRICS_PATH, registry
+from radar.notify import send_email, send_telegram
+from radar.ollama import warm_up
+from radar.scheduler import Refresher, Snapshot
+from radar.search import get_index
+
+
+@st.cache_resource
+def get_refresher(model: str) -> Refresher:
+    # Un solo hilo de refresco por modelo, compartido por todas las sesiones.
+    # Cada Ollama carga el modelo mientras se descargan los feeds
+    for host in OLLAMA_HOSTS:
+        threading.Thread(target=warm_up, args=(model, host), daemon=True, name="ollama-warmup").start()
+    return Refresher(model).start()
+
+
+ORDERED_COLS = ["source", "date", "title", "sentiment", "tldr", "link"]
+DATE_FORMAT = "%d-%m-%Y %H:%M"
+
+
+def load_snapshot(model: str, feeds, max_n, since=None) -> Snapshot:
+    """Última foto del pipeline.
+
+    Si todavía no hay ninguna, se muestran las noticias a medida que se
+    resumen y se corta la ejecución del script hasta que la foto esté lista.
+    """
+    snap = get_refresher(model).snapshot(feeds, max_n, since)
+    if snap is None:
+        live_progress(model, feeds, max_n, since)
+        st.stop()
+    return snap
+
+
+@st.fragment(run_every=1.0)
+def live_progress(model: str, feeds, max_n, since=None):
+    refresher = get_refresher(model)
+    if refresher.snapshot(feeds, max_n, since) is not None:
+        st.rerun()
+    st.info("Preparando las noticias; los resúmenes aparecen a medida que se generan.", icon=":material/hourglass_top:")
+    df = refresher.live(feeds, max_n, since)
+    if df is not None and not df.empty:
+        done = int(df["sentiment"].notna().sum())
+        st.progress(done / len(df), text=f"{done} de {len(df)} resúmenes listos")
+        st.dataframe(display_dates(df)[ORDERED_COLS], use_container_width=True)
+
+
+def refresh_controls(model: str, snap: Snapshot):
+    if st.sidebar.button("Actualizar", icon=":material/autorenew:"):
+        get_refresher(model).refresh()
+        st.sidebar.info("Actualizando en segundo plano; las noticias nuevas aparecen al terminar.")
+    st.sidebar.caption(f"Última actualización: {datetime.fromtimestamp(snap.updated, ARGENTINA_TZ):%d-%m-%Y %H:%M}")
+    if snap.error:
+        st.sidebar.warning(f"Falló el último refresco: {snap.error}", icon=":material/warning:")
+    pending = int(snap.df["tldr"].isna().sum())
+    if pending:
+        st.sidebar.warning(f"{pending} noticias sin resumen: Ollama no respondió. Se reintentan en segundo plano.",
+                           icon=":material/hourglass_empty:")
+
+
+def diagnostics_panel():
+    """Tiempos por etapa y contadores del pipeline, en un panel plegable."""
+    metrics = registry.snapshot()
+    with st.sidebar.expander("🩺 Diagnóstico"):
+        if not metrics["timers"]:
+            st.caption("Todavía no hay mediciones.")
+            return
+        counters = {}
+        for c in metrics["counters"]:
+            counters.setdefault(c["name"], {}).setdefault(c["labels"].get("model"), 0)
+            counters[c["name"]][c["labels"].get("model")] += c["value"]
+        for model, tokens in counters.get("ollama_eval_tokens", {}).items():
+            seconds = counters["ollama_eval_seconds"].get(model, 0)
+            if seconds:
+                st.metric(f"Tokens/s · {model}", f"{tokens / seconds:.1f}")
+        hits = sum(counters.get("summary_cache_hits", {}).values())
+        misses = sum(counters.get("summary_cache_misses", {}).values())
+        if hits + misses:
+            st.metric("Aciertos del caché de resúmenes", f"{hits / (hits + misses):.0%}")
+
+        timers = pd.DataFrame([{
+            "etapa": t["stage"],
+            "etiquetas": ", ".join(f"{k}={v}" for k, v in t["labels"].items()),
+            "n": t["count"],
+            "media (s)": t["mean_s"],
+            "p95 (s)": t["p95_s"],
+            "máx (s)": t["max_s"],
+        } for t in metrics["timers"]]).sort_values(["etapa", "etiquetas"])
+        st.dataframe(timers, hide_index=True, use_container_width=True)
+        errors = [c for c in metrics["counters"]
+                  if c["name"] in ("ollama_errors", "ollama_short_circuit", "ollama_unavailable",
+                                   "ollama_retry_gave_up", "feed_errors")]
+        if errors:
+            st.dataframe(pd.DataFrame([{
+                "contador": c["name"],
+                "etiquetas": ", ".join(f"{k}={v}" for k, v in c["labels"].items()),
+                "valor": c["value"],
+            } for c in errors]), hide_index=True, use_container_width=True)
+        st.caption(f"Detalle completo en `{METRICS_PATH}`")
+
+
+def display_dates(df, fmt: str = DATE_FORMAT):
+    """Copia de `df` con `date` como texto, sólo para mostrar.
+
+    El DataFrame original conserva la columna tipada (para filtrar y
+    exportar); sin fecha parseada se muestra el comienzo de `published_text`.
+    """
+    text = df["date"].dt.strftime(fmt)
+    if "published_text" in df.columns:
+        # Fallback a solo fecha si no hay 'published_parsed'
+        fallback = df["published_text"].fillna("").str[:10]
+        text = text.fillna(fallback.where(fallback != ""))
+    return df.assign(date=text.fillna("Fecha no disponible"))
+
+
+def keyword_filter(df, model: str, query: str):
+    """Filas de `df` que coinciden con `query`, ordenadas por relevancia."""
+    ranks = get_index().search(model, query)
+    rank = pd.Series([ranks.get(k) for k in zip(df["source"], df["key"])], index=df.index, dtype=float)
+    return df.loc[rank.dropna().sort_values(kind="stable").index]
+
+
+def notify_email(subject, body):
+    try:
+        send_email(subject, body)
+        st.success("📧 Notificación enviada por correo.")
+    except Exception as e:
+        st.error(f"Error enviando email: {e}")
+
+
+def notify_telegram(message):
+    try:
+        if send_telegram(message):
+            st.success("Mensaje enviado por Telegram.", icon=":material/done_all:")
+        else:
+            st.error("Falló el envío por Telegram.", icon=":material/error:")
+    except Exception as e:
+        st.error(f"Error en Telegram: {e}")
+
+
+def page_header():
+    st.set_page_config(page_title="Noticias Económicas", layout="wide", page_icon=":material/newspaper:")
+    with open("asset/styles.css") as f:
+        st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
+    st.markdown("<h1>📈 Resumen de Información Económica Inteligente</h1>", unsafe_allow_html=True)
+
+
+def download_buttons(df, labels, columns):
+    # Los archivos se generan recién al hacer clic (y se reutilizan si los
+    # datos no cambiaron); on_click="ignore" evita un rerun por la descarga
+    files = [("csv", "noticias.csv", "text/csv"),
+             ("xlsx", "noticias.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+             ("docx", "noticias.docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document")]
+    for label, column, (kind, file_name, mime) in zip(labels, columns, files):
+        with column:
+            st.download_button(label, lazy_export(kind, df), file_name, mime=mime, on_click="ignore",
+                               icon=":material/download:")
+
+
+def notifications(df):
+    with st.container(border=True):
+        st.subheader("Enviar la información por mail o telegram")
+        col3, col4 = st.columns(2, vertical_alignment="center")
+        with col3:
+            if st.button("Enviar notificación por correo", icon=":material/local_post_office:"):
+                notify_email("Noticias Económicas", df.to_string())
+        with col4:
+            if st.button("Enviar notificación por Telegram", icon=":material/send:"):
+                notify_telegram("Nuevas noticias disponibles. Revisá Radar Económico.")
+
+
+def sentiment_chart(df):
+    with st.container(border=True):
+        st.subheader("Sentimiento por Fuente")
+        if not df.empty:
+            # Agrupamos los datos
+            chart_data = df.groupby(["source", "sentiment"]).size().reset_index(name="count")
+
+            # Creamos un gráfico de barras apiladas
+            chart = alt.Chart(chart_data).mark_bar().encode(
+                x=alt.X('source:N', title='Fuente', axis=alt.Axis(labelAngle=0)),
+                y=alt.Y('count:Q', title='Cantidad'),
+                color=alt.Color('sentiment:N', title="Sentimiento", scale=alt.Scale(
+                    domain=["Positiva", "Neutra", "Negativa"],
+                    range=["#2ecc71", "#f1c40f", "#e74c3c"]
+                )),
+                tooltip=["source", "sentiment", "count"]
+            ).properties(
+                height=400
+            )
+
+            # Mostrar el gráfico ajustado al contenedor
+            st.altair_chart(chart, use_container_width=True)
+
+
+def footer():
+    st.write("---")
+    with st.container():
+        st.write("&copy; - derechos reservados -  2025 -  Walter Gómez - FullStack Developer - Data Science - Business Intelligence")
+        left, right = st.columns(2, gap='medium', vertical_alignment="bottom")
+        with left:
+            st.link_button("Mi LinkedIn", "https://www.linkedin.com/in/walter-gomez-fullstack-developer-datascience-businessintelligence-finanzas-python/", use_container_width=True)
+        with right:
+            st.link_button("Mi Porfolio", "https://walter-portfolio-animado.netlify.app/", use_container_width=True)
+
+
+def render_app(model: str, caption: str):
+    page_header()
+
+    st.sidebar.title("Opciones")
+    sel = st.sidebar.multiselect("📰 Fuentes", list(RSS_MAP), list(RSS_MAP))
+    max_n = st.sidebar.slider("📑 Noticias por fuente", 5, 30, 10)
+
+    snap = load_snapshot(model, tuple(sel), max_n)
+    refresh_controls(model, snap)
+    diagnostics_panel()
+
+    df = snap.df
+
+    query = st.text_input("🔍 Buscar por palabra clave")
+    if query:
+        df = keyword_filter(df, model, query)
+
+    if not df.empty:
+        st.write("---")
+        # Reordenamos las columnas; las descargas reciben las fechas tipadas
+        view = display_dates(df)[ORDERED_COLS]
+        df = df[ORDERED_COLS]
+        with st.container(border=True):
+            st.dataframe(view, use_container_width=True)
+            st.subheader("Descargar la información en distintos formatos")
+            col1, col2, col3 = st.columns(3, vertical_alignment="center")
+            download_buttons(df, ("Descargar CSV", "Descargar Excel", "Descargar Word"), (col1, col2, col3))
+
+        notifications(view)
+        sentiment_chart(df)
+        st.caption(caption)
+    else:
+        st.warning("No se encontraron noticias para mostrar.", icon=":material/warning:")
+
+    footer()